@@ -64,6 +64,6 @@ echo "=========================================="
 echo "Setup complete!"
 echo ""
 echo "Next steps:"
-echo "  1. Run warmup: python scripts/warmup.py"
+echo "  1. Run warmup: python -m scripts.warmup"
 echo "  2. Start server: python -m src.main"
 echo "=========================================="
@@ -3,18 +3,26 @@
 Model Warmup Script
 
 CRITICAL: Run this before accepting calls!
+Run from the repo root as a module: python -m scripts.warmup
 
 First inference after model load takes ~850ms (CUDA graph compilation).
 After warmup, Parakeet runs at 34-38ms.
-"""
-import sys
-import os
-
-# Add src to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+The three model loads run concurrently (disk reads, config parsing and H2D
+copies overlap); warmup inference only starts once every load has landed.
+"""
 import logging
+import os
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+# Neither imports torch; the model modules are imported in main() once the
+# process has been pinned and the compile cache configured
+from src.config import settings
+from src import gpu_utils
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,6 +31,89 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Kokoro weights/voice packs (KPipeline's default repo)
+KOKORO_REPO_ID = "hexgrad/Kokoro-82M"
+
+# Below this share of free GPU memory, LLM and TTS warm one after the other
+MIN_FREE_FRACTION_FOR_CONCURRENT_WARMUP = 0.15
+
+
+def _hf_hub_cache() -> Path:
+    """Hugging Face hub cache dir, resolved the same way huggingface_hub does."""
+    if os.environ.get("HF_HUB_CACHE"):
+        return Path(os.environ["HF_HUB_CACHE"])
+    hf_home = os.environ.get("HF_HOME", os.path.join(Path.home(), ".cache", "huggingface"))
+    return Path(hf_home) / "hub"
+
+
+def readahead_model_files(repo_ids):
+    """
+    Ask the kernel to start reading cached model files into the page cache.
+
+    Issues POSIX_FADV_WILLNEED on every file in each repo's cached snapshots,
+    so disk reads overlap the torch/transformers/nemo imports that precede
+    the actual loads. Missing repos are skipped.
+    """
+    start = time.perf_counter()
+    total_bytes = 0
+    for repo_id in repo_ids:
+        repo_dir = _hf_hub_cache() / f"models--{repo_id.replace('/', '--')}" / "snapshots"
+        for path in repo_dir.glob("*/**/*"):
+            if not path.is_file():
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                total_bytes += os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+    logger.info(
+        f"  Readahead queued for {total_bytes / 1e9:.2f}GB of model files "
+        f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+
+
+def verify_ready(stt, llm, tts) -> bool:
+    """
+    Time one request per model on already-warmed shapes against its SLO.
+
+    Returns True only if every model responds within its configured budget,
+    i.e. none of them is still paying first-call setup (kernel selection,
+    allocator growth, lazy initialization). This times whichever path each
+    model serves live: eager generate() for the LLM unless llm_compile is
+    set, NeMo's graph decoder for Parakeet.
+    """
+    import numpy as np
+
+    checks = {
+        "STT": (
+            lambda: stt.transcribe_numpy(np.zeros(2 * 16000, dtype=np.float32)),
+            settings.warmup_slo_stt_ms,
+        ),
+        "LLM": (
+            lambda: llm.generate_simple("Hi, my sink is leaking.", max_tokens=16),
+            settings.warmup_slo_llm_ms,
+        ),
+        "TTS": (
+            lambda: tts.synthesize("Thanks for calling, how can I help?"),
+            settings.warmup_slo_tts_ms,
+        ),
+    }
+
+    ready = True
+    for name, (check_fn, slo_ms) in checks.items():
+        start = time.perf_counter()
+        check_fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        ok = elapsed <= slo_ms
+        ready = ready and ok
+        logger.info(f"  {name}: {elapsed:.1f}ms (SLO {slo_ms:.0f}ms) {'OK' if ok else 'FAIL'}")
+    return ready
+
+
 def main():
     logger.info("=" * 60)
     logger.info("BuddyHelps Model Warmup")
@@ -30,41 +121,172 @@ def main():
 
     total_start = time.perf_counter()
 
-    # Warmup STT (most critical - CUDA graphs)
-    logger.info("\n[1/3] Loading and warming up STT (Parakeet)...")
-    from src import stt
-    stt.load_model()
-    stt.warmup(num_runs=3)
-
-    # Load LLM
-    logger.info("\n[2/3] Loading LLM (Qwen2.5-0.5B)...")
-    from src import llm
-    llm.load_model()
-
-    # Test LLM
-    logger.info("Testing LLM...")
-    test_response = llm.generate_simple(
-        "Hello, I have a plumbing problem.",
-        business_name="Test Plumbing",
-        owner_name="Mike",
-    )
-    logger.info(f"LLM test response: {test_response[:100]}...")
+    # Never leave a stale readiness signal from a previous boot
+    if os.path.exists(settings.ready_file):
+        os.unlink(settings.ready_file)
+
+    # Before torch starts any threads or allocates pinned buffers
+    gpu_utils.pin_to_gpu_numa_node()
+
+    # Start page-cache readahead of the weights while torch & co. import
+    if settings.stt_backend == "whisper":
+        stt_repo_id = f"Systran/faster-whisper-{settings.whisper_model_size}"
+    else:
+        stt_repo_id = settings.stt_model
+    threading.Thread(
+        target=readahead_model_files,
+        args=((stt_repo_id, settings.llm_model, KOKORO_REPO_ID),),
+        daemon=True,
+    ).start()
+
+    # Before any model import/forward so kernels land in the persistent cache
+    gpu_utils.configure_compile_cache(settings.compile_cache_dir)
+    gpu_utils.enable_tf32()
+
+    import torch
+    from src import llm, tts
+    if settings.stt_backend == "whisper":
+        from src import stt_whisper as stt
+    else:
+        from src import stt
+
+    def load_stt():
+        if settings.stt_backend == "whisper":
+            return stt.load_model(
+                model_size=settings.whisper_model_size,
+                num_instances=settings.whisper_num_instances,
+                device=settings.whisper_device,
+                compute_type=settings.whisper_compute_type,
+            )
+        return stt.load_model(settings.stt_model)
+
+    def load_llm():
+        llm.load_model(
+            settings.llm_model, quant=settings.llm_quant, compile=settings.llm_compile
+        )
+        llm.warmup_tokenizer()
+        # Prefill/decode warmup overlaps the remaining STT/TTS loads
+        # (inference_mode is thread-local, so it is entered per worker)
+        with torch.inference_mode():
+            llm.warmup_prefill(lens=(32, 64, 128, 256, 512))
+            llm.warmup_decode(batch_sizes=(1, 2, 4, 8), prompt_len=32, decode_len=32)
+
+    loaders = {
+        f"STT ({settings.stt_backend})": load_stt,
+        "LLM (Qwen2.5-0.5B)": load_llm,
+        "TTS (Kokoro)": tts.load_model,
+    }
+
+    def load_on_side_stream(name, load_fn):
+        with gpu_utils.side_stream(), gpu_utils.cuda_timer() as elapsed_ms:
+            load_fn()
+        logger.info(f"  {name} loaded in {elapsed_ms() / 1000:.1f}s")
+
+    # Load all three models concurrently
+    logger.info("\n[1/3] Loading STT, LLM and TTS in parallel...")
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        futures = [
+            executor.submit(load_on_side_stream, name, load_fn)
+            for name, load_fn in loaders.items()
+        ]
+        wait(futures)
+    for future in futures:
+        future.result()  # Re-raise any load failure
+
+    # All weight copies must land before warmup kernels are queued
+    gpu_utils.synchronize()
+
+    def warm_stt():
+        # Warmup STT (most critical - CUDA graphs)
+        stt.warmup(num_runs=3)
+
+    def warm_llm():
+        # Test LLM with a concurrent batch, shaped like several live calls at once
+        first_turn = [{"role": "user", "content": "Hello, I have a plumbing problem."}]
+        follow_up = first_turn + [
+            {"role": "assistant", "content": "Sorry to hear that! What's going on?"},
+            {"role": "user", "content": "My kitchen sink is leaking under the cabinet."},
+        ]
+        warmup_conversations = [first_turn, follow_up] + [
+            [{"role": "user", "content": text}]
+            for text in (
+                "My water heater stopped working this morning.",
+                "Can someone come look at a clogged drain?",
+                "There's water coming through my ceiling.",
+                "I need a quote for replacing a toilet.",
+                "My basement is flooding, please help.",
+                "Do you do sewer line inspections?",
+            )
+        ]
+        test_responses = llm.generate_batch(
+            warmup_conversations,
+            business_name="Test Plumbing",
+            owner_name="Mike",
+            max_tokens=16,
+        )
+        logger.info(
+            f"LLM batch test ({len(test_responses)} prompts): {test_responses[0][:100]}..."
+        )
+
+    def warm_tts():
+        # Warm TTS for every voice and output length
+        tts.warmup(voices=tts.list_voices(), lengths=(20, 60, 120))
+
+    # Each model warms on its own stream; there are no data dependencies
+    # between them, so nothing waits until the single sync at the end.
+    # Stage GPU times are read from CUDA events after that sync.
+    stage_timers = {}
+
+    def run_stage(name, warm_fn):
+        # inference_mode is thread-local, so it is entered per stage
+        with torch.inference_mode():
+            with gpu_utils.side_stream(), gpu_utils.cuda_timer() as stage_timers[name]:
+                warm_fn()
+
+    logger.info("\n[2/3] Warming up STT...")
+    run_stage("STT warmup", warm_stt)
+
+    # LLM and TTS have disjoint weights: warm them concurrently unless the
+    # GPU is short on memory for both sets of activations at once
+    logger.info("\n[3/3] Testing LLM and TTS...")
+    llm_tts_stages = {"LLM batch test": warm_llm, "TTS warmup": warm_tts}
+    free_fraction = gpu_utils.free_memory_fraction()
+    if free_fraction < MIN_FREE_FRACTION_FOR_CONCURRENT_WARMUP:
+        logger.info(f"  Only {free_fraction:.0%} GPU memory free - warming sequentially")
+        for name, warm_fn in llm_tts_stages.items():
+            run_stage(name, warm_fn)
+    else:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(llm_tts_stages)) as executor:
+            futures = [
+                executor.submit(run_stage, name, warm_fn)
+                for name, warm_fn in llm_tts_stages.items()
+            ]
+            wait(futures)
+        for future in futures:
+            future.result()  # Re-raise any warmup failure
+        logger.info(f"  LLM + TTS warmed concurrently in {time.perf_counter() - start:.1f}s")
+
+    gpu_utils.synchronize()
+    for name, elapsed_ms in stage_timers.items():
+        logger.info(f"  {name}: {elapsed_ms():.1f}ms GPU")
 
-    # Load TTS
-    logger.info("\n[3/3] Loading TTS (Kokoro)...")
-    from src import tts
-    tts.load_model()
+    # Verify every model now serves within its SLO before signalling ready
+    logger.info("\nVerifying warmed models...")
+    with torch.inference_mode():
+        ready = verify_ready(stt, llm, tts)
+    if not ready:
+        logger.error("Warmup verification failed - not marking ready")
+        sys.exit(1)
 
-    # Test TTS
-    logger.info("Testing TTS...")
-    audio, sr = tts.synthesize("Hello, this is Benny with Test Plumbing.")
-    logger.info(f"TTS test: Generated {len(audio)} samples at {sr}Hz")
+    with open(settings.ready_file, "w"):
+        pass
 
     total_elapsed = time.perf_counter() - total_start
 
     logger.info("\n" + "=" * 60)
     logger.info(f"Warmup complete in {total_elapsed:.1f}s")
-    logger.info("All models loaded and ready for inference!")
+    logger.info(f"All models loaded and ready for inference! ({settings.ready_file})")
     logger.info("=" * 60)
 
 
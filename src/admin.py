@@ -2,19 +2,124 @@
 Admin routes for managing phone numbers, system prompts, keyword corrections, and Twilio numbers.
 Tabbed HTML UI + JSON API.
 """
+import asyncio
+import gzip
+import hashlib
 import logging
+import operator
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import orjson
+from pathlib import Path
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from src import database as db
 from src.config import settings
 
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+try:
+    from twilio.rest import Client as TwilioClient
+except ImportError:  # Twilio is optional; the /api/twilio/* routes report it
+    TwilioClient = None
+
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# orjson serializes the list payloads several times faster than stdlib json
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# ============ List cache ============
+
+# Admin tables only change through the write handlers in this file, so list
+# reads are served from a short-lived in-process cache that writes clear.
+LIST_CACHE_TTL = 30.0  # seconds
+
+# key -> (fetched_at, write generation the value was fetched under, value)
+_list_cache: Dict[str, Tuple[float, int, Any]] = {}
+_list_cache_lock = threading.Lock()
+
+# Per-table write counters backing the list ETags. The boot id keeps a
+# restarted process from handing out tags a browser cached before the restart.
+_BOOT_ID = secrets.token_hex(4)
+_gen: Dict[str, int] = {"numbers": 0, "prompts": 0, "keywords": 0}
+
+
+def _cached(key: str, fetch: Callable[[], Any], ttl: float = LIST_CACHE_TTL) -> Tuple[int, Any]:
+    """
+    Return (generation, result) for key, calling fetch() if missing or stale.
+    The result reflects at least every write up to that generation.
+    """
+    now = time.monotonic()
+    with _list_cache_lock:
+        entry = _list_cache.get(key)
+        if entry and now - entry[0] < ttl:
+            return entry[1], entry[2]
+        generation = _gen[key]
+
+    value = fetch()
+    with _list_cache_lock:
+        # Only cache if no write landed while fetching; otherwise value may
+        # predate that write and would outlive its invalidation.
+        if _gen[key] == generation:
+            _list_cache[key] = (now, generation, value)
+    return generation, value
+
+
+def _invalidate(*keys: str):
+    """Drop cached lists so the next read goes to the database."""
+    with _list_cache_lock:
+        for key in keys:
+            _list_cache.pop(key, None)
+            _gen[key] += 1
+
+
+def _generation_etag(generations) -> str:
+    return f'W/"{_BOOT_ID}-' + "-".join(str(g) for g in generations) + '"'
+
+
+def _conditional(request: Request, fetchers: Dict[str, Callable[[], Any]]) -> Response:
+    """
+    Serve cached lists with a generation ETag, or an empty 304 if the
+    client's copy is current. One list is served bare; several as an
+    object keyed by table.
+    """
+    with _list_cache_lock:
+        current = _generation_etag(_gen[key] for key in fetchers)
+    if request.headers.get("if-none-match") == current:
+        return Response(status_code=304, headers={"ETag": current, "Cache-Control": "no-cache"})
+
+    # Tag the body with the generations it was fetched under, not the
+    # counters now: if a write raced the fetch, the client's next request
+    # misses and refetches instead of a 304 confirming pre-write rows.
+    generations, values = [], {}
+    for key, fetch in fetchers.items():
+        generation, values[key] = _cached(key, fetch)
+        generations.append(generation)
+    body = values.popitem()[1] if len(values) == 1 else values
+    headers = {"ETag": _generation_etag(generations), "Cache-Control": "no-cache"}
+    return ORJSONResponse(body, headers=headers)
+
+
+def _etag_response(request: Request, data: Any) -> Response:
+    """Serve data with a content-hash ETag, or an empty 304 if the client's copy matches."""
+    body = orjson.dumps(data)
+    etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 # ============ Phone Numbers API ============
+# DB-backed handlers are plain `def`: the sqlite calls block, so Starlette
+# runs them in its threadpool instead of on the event loop.
 
 class PhoneNumberCreate(BaseModel):
     phone_number: str
@@ -35,40 +140,52 @@ class PhoneNumberUpdate(BaseModel):
     is_demo: Optional[bool] = None
     is_active: Optional[bool] = None
 
+# Fields a PUT may clear with an explicit null; the rest are NOT NULL columns
+# (or booleans), so null there is a client error rather than a DB error
+_NULLABLE_NUMBER_FIELDS = frozenset({"system_prompt_id", "keyword_corrections_id"})
+
 @router.get("/api/numbers")
-async def list_numbers():
+def list_numbers(request: Request):
     """List all phone numbers."""
-    return db.get_all_numbers()
+    return _conditional(request, {"numbers": db.get_all_numbers})
 
 @router.get("/api/numbers/{phone}")
-async def get_number(phone: str):
+def get_number(phone: str, request: Request):
     """Get a specific phone number."""
     result = db.get_number(phone)
     if not result:
         raise HTTPException(status_code=404, detail="Number not found")
-    return result
+    return _etag_response(request, result)
 
 @router.post("/api/numbers")
-async def create_number(data: PhoneNumberCreate):
+def create_number(data: PhoneNumberCreate):
     """Create a new phone number."""
-    existing = db.get_number(data.phone_number)
-    if existing:
+    try:
+        result = db.add_number(**data.model_dump())
+    except sqlite3.IntegrityError:
         raise HTTPException(status_code=400, detail="Number already exists")
-    return db.add_number(**data.dict())
+    _invalidate("numbers")
+    return result
 
 @router.put("/api/numbers/{phone}")
-async def update_number(phone: str, data: PhoneNumberUpdate):
+def update_number(phone: str, data: PhoneNumberUpdate):
     """Update a phone number."""
-    existing = db.get_number(phone)
-    if not existing:
+    # Only fields the client sent; an explicit null clears a prompt/keyword link
+    updates = data.model_dump(exclude_unset=True)
+    for field, value in updates.items():
+        if value is None and field not in _NULLABLE_NUMBER_FIELDS:
+            raise HTTPException(status_code=400, detail=f"{field} cannot be null")
+    result = db.update_number(phone, **updates)
+    if result is None:
         raise HTTPException(status_code=404, detail="Number not found")
-    updates = {k: v for k, v in data.dict().items() if v is not None}
-    return db.update_number(phone, **updates)
+    _invalidate("numbers")
+    return result
 
 @router.delete("/api/numbers/{phone}")
-async def delete_number(phone: str):
+def delete_number(phone: str):
     """Delete a phone number."""
     if db.delete_number(phone):
+        _invalidate("numbers")
         return {"status": "deleted"}
     raise HTTPException(status_code=404, detail="Number not found")
 
@@ -84,40 +201,47 @@ class PromptUpdate(BaseModel):
     content: Optional[str] = None
 
 @router.get("/api/prompts")
-async def list_prompts():
+def list_prompts(request: Request):
     """List all system prompts."""
-    return db.get_all_prompts()
+    return _conditional(request, {"prompts": db.get_all_prompts})
 
 @router.get("/api/prompts/{prompt_id}")
-async def get_prompt(prompt_id: int):
+def get_prompt(prompt_id: int, request: Request):
     """Get a specific system prompt."""
     result = db.get_prompt(prompt_id)
     if not result:
         raise HTTPException(status_code=404, detail="Prompt not found")
-    return result
+    return _etag_response(request, result)
 
 @router.post("/api/prompts")
-async def create_prompt(data: PromptCreate):
+def create_prompt(data: PromptCreate):
     """Create a new system prompt."""
     try:
-        return db.add_prompt(data.name, data.content)
-    except Exception as e:
-        if "UNIQUE" in str(e):
-            raise HTTPException(status_code=400, detail="Prompt name already exists")
-        raise
+        result = db.add_prompt(data.name, data.content)
+    except sqlite3.IntegrityError:
+        raise HTTPException(status_code=400, detail="Prompt name already exists")
+    _invalidate("prompts")
+    return result
 
 @router.put("/api/prompts/{prompt_id}")
-async def update_prompt(prompt_id: int, data: PromptUpdate):
+def update_prompt(prompt_id: int, data: PromptUpdate):
     """Update a system prompt."""
-    existing = db.get_prompt(prompt_id)
-    if not existing:
+    try:
+        result = db.update_prompt(prompt_id, **data.model_dump(exclude_unset=True))
+    except sqlite3.IntegrityError:
+        raise HTTPException(status_code=400, detail="Prompt name already exists")
+    if result is None:
         raise HTTPException(status_code=404, detail="Prompt not found")
-    return db.update_prompt(prompt_id, data.name, data.content)
+    # Number rows carry the joined prompt name
+    _invalidate("prompts", "numbers")
+    return result
 
 @router.delete("/api/prompts/{prompt_id}")
-async def delete_prompt(prompt_id: int):
+def delete_prompt(prompt_id: int):
     """Delete a system prompt."""
     if db.delete_prompt(prompt_id):
+        # Deleting a prompt also unlinks it from numbers
+        _invalidate("prompts", "numbers")
         return {"status": "deleted"}
     raise HTTPException(status_code=404, detail="Prompt not found")
 
@@ -133,52 +257,93 @@ class KeywordsUpdate(BaseModel):
     corrections: Optional[Dict[str, str]] = None
 
 @router.get("/api/keywords")
-async def list_keywords():
+def list_keywords(request: Request):
     """List all keyword correction sets."""
-    return db.get_all_keywords()
+    return _conditional(request, {"keywords": db.get_all_keywords})
 
 @router.get("/api/keywords/{keyword_id}")
-async def get_keywords(keyword_id: int):
+def get_keywords(keyword_id: int, request: Request):
     """Get a specific keyword correction set."""
     result = db.get_keywords(keyword_id)
     if not result:
         raise HTTPException(status_code=404, detail="Keyword set not found")
-    return result
+    return _etag_response(request, result)
 
 @router.post("/api/keywords")
-async def create_keywords(data: KeywordsCreate):
+def create_keywords(data: KeywordsCreate):
     """Create a new keyword correction set."""
     try:
-        return db.add_keywords(data.name, data.corrections)
-    except Exception as e:
-        if "UNIQUE" in str(e):
-            raise HTTPException(status_code=400, detail="Keyword set name already exists")
-        raise
+        result = db.add_keywords(data.name, data.corrections)
+    except sqlite3.IntegrityError:
+        raise HTTPException(status_code=400, detail="Keyword set name already exists")
+    _invalidate("keywords")
+    return result
 
 @router.put("/api/keywords/{keyword_id}")
-async def update_keywords(keyword_id: int, data: KeywordsUpdate):
+def update_keywords(keyword_id: int, data: KeywordsUpdate):
     """Update a keyword correction set."""
-    existing = db.get_keywords(keyword_id)
-    if not existing:
+    try:
+        result = db.update_keywords(keyword_id, **data.model_dump(exclude_unset=True))
+    except sqlite3.IntegrityError:
+        raise HTTPException(status_code=400, detail="Keyword set name already exists")
+    if result is None:
         raise HTTPException(status_code=404, detail="Keyword set not found")
-    return db.update_keywords(keyword_id, data.name, data.corrections)
+    # Number rows carry the joined keyword set name
+    _invalidate("keywords", "numbers")
+    return result
 
 @router.delete("/api/keywords/{keyword_id}")
-async def delete_keywords(keyword_id: int):
+def delete_keywords(keyword_id: int):
     """Delete a keyword correction set."""
     if db.delete_keywords(keyword_id):
+        # Deleting a keyword set also unlinks it from numbers
+        _invalidate("keywords", "numbers")
         return {"status": "deleted"}
     raise HTTPException(status_code=404, detail="Keyword set not found")
 
 
+# ============ Admin Bootstrap API ============
+
+@router.get("/api/admin/bootstrap")
+def admin_bootstrap(request: Request):
+    """Numbers, prompts and keyword sets in one response for the admin page load."""
+    return _conditional(request, {
+        "numbers": db.get_all_numbers,
+        "prompts": db.get_all_prompts,
+        "keywords": db.get_all_keywords,
+    })
+
+
 # ============ Twilio Numbers API ============
+# The Twilio SDK is blocking; each API round-trip runs via asyncio.to_thread.
+
+# Settings don't change at runtime; bind the ones used per request once
+_TWILIO_SID = settings.twilio_account_sid
+_TWILIO_TOKEN = settings.twilio_auth_token
+_WEBHOOK_URL = f"https://{settings.runpod_endpoint}/twilio/voice"
+
+# Shared client: its HTTP client keeps one requests.Session, so connections
+# (and TLS sessions) to api.twilio.com are reused across admin requests
+_twilio_client = None
+_twilio_client_lock = threading.Lock()
+
 
 def get_twilio_client():
-    """Get Twilio client, lazy import to avoid startup errors if not configured."""
-    if not settings.twilio_account_sid or not settings.twilio_auth_token:
+    """Get the shared Twilio client, creating it on first use."""
+    global _twilio_client
+
+    if _twilio_client is not None:
+        return _twilio_client
+
+    if not _TWILIO_SID or not _TWILIO_TOKEN:
         raise HTTPException(status_code=500, detail="Twilio credentials not configured")
-    from twilio.rest import Client
-    return Client(settings.twilio_account_sid, settings.twilio_auth_token)
+    if TwilioClient is None:
+        raise HTTPException(status_code=500, detail="Twilio SDK not installed")
+
+    with _twilio_client_lock:
+        if _twilio_client is None:
+            _twilio_client = TwilioClient(_TWILIO_SID, _TWILIO_TOKEN)
+    return _twilio_client
 
 
 # Area code to region mapping (US/Canada)
@@ -199,29 +364,39 @@ AREA_CODE_REGIONS = {
     "310": "Los Angeles, CA", "212": "New York, NY", "646": "New York, NY",
 }
 
-def get_region_from_phone(phone: str) -> str:
-    """Extract area code and return region."""
+def get_region_from_phone(phone: str, _lookup=AREA_CODE_REGIONS.get) -> str:
+    """Extract area code and return region (the area code itself if unmapped)."""
     # Phone format: +1XXXYYYZZZZ
-    if phone and len(phone) >= 5:
-        area_code = phone[2:5] if phone.startswith("+1") else phone[1:4]
-        return AREA_CODE_REGIONS.get(area_code, area_code)
-    return ""
+    if len(phone or "") < 5:
+        return ""
+    area_code = phone[2:5] if phone[:2] == "+1" else phone[1:4]
+    return _lookup(area_code, area_code)
+
+
+# One C-level fetch of every field the list endpoint returns, per row
+_twilio_number_fields = operator.attrgetter(
+    "phone_number", "sid", "friendly_name", "voice_url", "sms_url"
+)
 
 
 @router.get("/api/twilio/numbers")
-async def list_twilio_numbers():
+async def list_twilio_numbers(request: Request):
     """List all phone numbers owned by the Twilio account."""
     try:
         client = get_twilio_client()
-        numbers = client.incoming_phone_numbers.list(limit=50)
-        return [{
-            "phone": n.phone_number,
-            "sid": n.sid,
-            "friendly_name": n.friendly_name,
-            "voice_url": n.voice_url,
-            "sms_url": n.sms_url,
-            "region": get_region_from_phone(n.phone_number),
-        } for n in numbers]
+        numbers = await asyncio.to_thread(client.incoming_phone_numbers.list, limit=50)
+        # ETag lets the admin page revalidate its IndexedDB copy with a 304
+        return _etag_response(request, [
+            {
+                "phone": phone,
+                "sid": sid,
+                "friendly_name": friendly_name,
+                "voice_url": voice_url,
+                "sms_url": sms_url,
+                "region": get_region_from_phone(phone),
+            }
+            for phone, sid, friendly_name, voice_url, sms_url in map(_twilio_number_fields, numbers)
+        ])
     except HTTPException:
         raise
     except Exception as e:
@@ -229,12 +404,19 @@ async def list_twilio_numbers():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+_AREA_CODE_RE = re.compile(r"^\d{3}$")
+
+
 @router.get("/api/twilio/search")
 async def search_available_numbers(country: str = "CA", area_code: str = "587"):
     """Search for available phone numbers to purchase."""
+    # Reject bad input up front instead of letting int() raise into a 500
+    if area_code and not _AREA_CODE_RE.match(area_code):
+        raise HTTPException(status_code=400, detail="Area code must be 3 digits")
     try:
         client = get_twilio_client()
-        available = client.available_phone_numbers(country).local.list(
+        available = await asyncio.to_thread(
+            client.available_phone_numbers(country).local.list,
             area_code=int(area_code) if area_code else None,
             limit=10
         )
@@ -260,11 +442,10 @@ async def buy_twilio_number(data: TwilioBuyRequest):
     """Purchase a phone number and configure webhook."""
     try:
         client = get_twilio_client()
-        webhook_url = f"https://{settings.runpod_endpoint}/twilio/voice"
-
-        incoming = client.incoming_phone_numbers.create(
+        incoming = await asyncio.to_thread(
+            client.incoming_phone_numbers.create,
             phone_number=data.phone_number,
-            voice_url=webhook_url,
+            voice_url=_WEBHOOK_URL,
             voice_method="POST",
             friendly_name=f"BuddyHelps {data.phone_number[-4:]}"
         )
@@ -281,22 +462,25 @@ async def buy_twilio_number(data: TwilioBuyRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _configure_webhook(client, sid: str) -> dict:
+    """Point one Twilio number's voice webhook at this server (blocking)."""
+    number = client.incoming_phone_numbers(sid).update(
+        voice_url=_WEBHOOK_URL,
+        voice_method="POST"
+    )
+    return {
+        "phone": number.phone_number,
+        "voice_url": number.voice_url,
+        "friendly_name": number.friendly_name,
+    }
+
+
 @router.post("/api/twilio/configure/{sid}")
 async def configure_twilio_number(sid: str):
     """Configure webhook on an existing Twilio number."""
     try:
         client = get_twilio_client()
-        webhook_url = f"https://{settings.runpod_endpoint}/twilio/voice"
-
-        number = client.incoming_phone_numbers(sid).update(
-            voice_url=webhook_url,
-            voice_method="POST"
-        )
-        return {
-            "phone": number.phone_number,
-            "voice_url": number.voice_url,
-            "friendly_name": number.friendly_name,
-        }
+        return await asyncio.to_thread(_configure_webhook, client, sid)
     except HTTPException:
         raise
     except Exception as e:
@@ -304,6 +488,33 @@ async def configure_twilio_number(sid: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class TwilioBulkConfigureRequest(BaseModel):
+    sids: List[str]
+
+
+@router.post("/api/twilio/configure-bulk")
+async def configure_twilio_numbers_bulk(data: TwilioBulkConfigureRequest):
+    """
+    Configure webhooks on several Twilio numbers concurrently.
+
+    Returns one result per SID; a failure on one number doesn't fail the rest.
+    """
+    client = get_twilio_client()
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(_configure_webhook, client, sid) for sid in data.sids),
+        return_exceptions=True,
+    )
+
+    results = []
+    for sid, outcome in zip(data.sids, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Twilio configure error for {sid}: {outcome}")
+            results.append({"sid": sid, "status": "error", "error": str(outcome)})
+        else:
+            results.append({"sid": sid, "status": "configured", **outcome})
+    return results
+
+
 class TwilioUpdateRequest(BaseModel):
     friendly_name: str
 
@@ -313,7 +524,8 @@ async def update_twilio_number(sid: str, data: TwilioUpdateRequest):
     """Update a Twilio number's friendly name."""
     try:
         client = get_twilio_client()
-        number = client.incoming_phone_numbers(sid).update(
+        number = await asyncio.to_thread(
+            client.incoming_phone_numbers(sid).update,
             friendly_name=data.friendly_name
         )
         return {
@@ -331,817 +543,114 @@ async def update_twilio_number(sid: str, data: TwilioUpdateRequest):
 
 # ============ HTML Admin UI ============
 
-ADMIN_HTML = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>BuddyHelps Admin</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        * { box-sizing: border-box; }
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }
-        h1 { color: #333; margin-bottom: 20px; }
-        .container { max-width: 1100px; margin: 0 auto; }
-        .card { background: white; border-radius: 8px; padding: 20px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        table { width: 100%; border-collapse: collapse; }
-        th, td { text-align: left; padding: 12px; border-bottom: 1px solid #eee; }
-        th { background: #f8f8f8; font-weight: 600; }
-        tr:hover { background: #f8f8f8; }
-        .badge { display: inline-block; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: 500; }
-        .badge-active { background: #d4edda; color: #155724; }
-        .badge-inactive { background: #f8d7da; color: #721c24; }
-        .badge-type { background: #e2e3e5; color: #383d41; }
-        button { padding: 8px 16px; border: none; border-radius: 4px; cursor: pointer; font-size: 14px; }
-        .btn-primary { background: #007bff; color: white; }
-        .btn-danger { background: #dc3545; color: white; }
-        .btn-success { background: #28a745; color: white; }
-        button:hover { opacity: 0.9; }
-        input, select, textarea { width: 100%; padding: 10px; border: 1px solid #ddd; border-radius: 4px; margin-bottom: 10px; font-size: 14px; font-family: inherit; }
-        label { display: block; margin-bottom: 4px; font-weight: 500; color: #555; }
-        .form-row { display: grid; grid-template-columns: 1fr 1fr; gap: 15px; }
-        .actions { display: flex; gap: 8px; }
-        .modal { display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.5); z-index: 100; overflow-y: auto; }
-        .modal-content { background: white; max-width: 600px; margin: 50px auto; padding: 20px; border-radius: 8px; }
-        .modal.active { display: block; }
-        .close { float: right; font-size: 24px; cursor: pointer; }
-        .empty { text-align: center; padding: 40px; color: #666; }
-
-        /* Tabs */
-        .tabs { display: flex; gap: 0; margin-bottom: 20px; }
-        .tab { padding: 12px 24px; background: #e9ecef; border: none; cursor: pointer; font-size: 14px; font-weight: 500; }
-        .tab:first-child { border-radius: 8px 0 0 8px; }
-        .tab:last-child { border-radius: 0 8px 8px 0; }
-        .tab.active { background: #007bff; color: white; }
-        .tab-content { display: none; }
-        .tab-content.active { display: block; }
-
-        /* Prompt preview */
-        .prompt-preview { font-size: 13px; color: #666; max-width: 300px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
-        code { background: #f4f4f4; padding: 2px 6px; border-radius: 3px; font-size: 12px; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>BuddyHelps Admin</h1>
-
-        <div class="tabs">
-            <button class="tab active" onclick="showTab('numbers')">Phone Numbers</button>
-            <button class="tab" onclick="showTab('prompts')">System Prompts</button>
-            <button class="tab" onclick="showTab('keywords')">Keywords</button>
-            <button class="tab" onclick="showTab('twilio')">Twilio Numbers</button>
-        </div>
-
-        <!-- Phone Numbers Tab -->
-        <div id="numbers-tab" class="tab-content active">
-            <div class="card">
-                <button class="btn-primary" onclick="showAddNumberModal()">+ Add Number</button>
-            </div>
-
-            <div class="card">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Phone Number</th>
-                            <th>Business</th>
-                            <th>Type</th>
-                            <th>Greeting</th>
-                            <th>Prompt</th>
-                            <th>Keywords</th>
-                            <th>Mode</th>
-                            <th>Status</th>
-                            <th>Actions</th>
-                        </tr>
-                    </thead>
-                    <tbody id="numbers-table">
-                        <tr><td colspan="9" class="empty">Loading...</td></tr>
-                    </tbody>
-                </table>
-            </div>
-        </div>
-
-        <!-- System Prompts Tab -->
-        <div id="prompts-tab" class="tab-content">
-            <div class="card">
-                <button class="btn-primary" onclick="showAddPromptModal()">+ Add Prompt</button>
-            </div>
-
-            <div class="card">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Name</th>
-                            <th>Preview</th>
-                            <th>Actions</th>
-                        </tr>
-                    </thead>
-                    <tbody id="prompts-table">
-                        <tr><td colspan="3" class="empty">Loading...</td></tr>
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="card">
-                <h3>Available Variables</h3>
-                <p>Use these in your prompts:</p>
-                <ul>
-                    <li><code>{business_name}</code> - The business name</li>
-                    <li><code>{owner_name}</code> - The owner's name</li>
-                    <li><code>{greeting_name}</code> - What the AI introduces itself as</li>
-                </ul>
-            </div>
-        </div>
-
-        <!-- Keywords Tab -->
-        <div id="keywords-tab" class="tab-content">
-            <div class="card">
-                <button class="btn-primary" onclick="showAddKeywordsModal()">+ Add Keyword Set</button>
-            </div>
-
-            <div class="card">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Name</th>
-                            <th>Corrections</th>
-                            <th>Actions</th>
-                        </tr>
-                    </thead>
-                    <tbody id="keywords-table">
-                        <tr><td colspan="3" class="empty">Loading...</td></tr>
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="card">
-                <h3>What Are Keywords?</h3>
-                <p>Phone audio quality causes STT to mishear domain-specific words. Keywords correct these before sending to the LLM.</p>
-                <p><strong>Example:</strong> "quogged" → "clogged", "fossit" → "faucet"</p>
-            </div>
-        </div>
-
-        <!-- Twilio Numbers Tab -->
-        <div id="twilio-tab" class="tab-content">
-            <div class="card">
-                <h3>Your Twilio Numbers</h3>
-                <p>Numbers owned by your Twilio account. Import them to BuddyHelps or configure webhooks.</p>
-                <button class="btn-primary" onclick="loadTwilioNumbers()" style="margin-top: 10px;">Refresh</button>
-            </div>
-
-            <div class="card">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Phone Number</th>
-                            <th>Region</th>
-                            <th>Friendly Name</th>
-                            <th>Voice URL</th>
-                            <th>Actions</th>
-                        </tr>
-                    </thead>
-                    <tbody id="twilio-numbers-table">
-                        <tr><td colspan="5" class="empty">Loading...</td></tr>
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="card">
-                <h3>Buy New Number</h3>
-                <div class="form-row">
-                    <div>
-                        <label>Country</label>
-                        <select id="twilio-country">
-                            <option value="CA">Canada</option>
-                            <option value="US">United States</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Area Code</label>
-                        <input type="text" id="twilio-area-code" placeholder="587" maxlength="3">
-                    </div>
-                </div>
-                <button class="btn-primary" onclick="searchTwilioNumbers()">Search Available Numbers</button>
-            </div>
-
-            <div class="card" id="twilio-search-results" style="display: none;">
-                <h3>Available Numbers</h3>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Phone Number</th>
-                            <th>Location</th>
-                            <th>Actions</th>
-                        </tr>
-                    </thead>
-                    <tbody id="twilio-search-table">
-                    </tbody>
-                </table>
-                <p style="font-size: 12px; color: #666; margin-top: 10px;">
-                    Cost: ~$1.15 CAD/month + ~$0.0085 USD/min inbound
-                </p>
-            </div>
-        </div>
-    </div>
-
-    <!-- Add/Edit Number Modal -->
-    <div id="number-modal" class="modal">
-        <div class="modal-content">
-            <span class="close" onclick="closeModal('number-modal')">&times;</span>
-            <h2 id="number-modal-title">Add Number</h2>
-            <form id="number-form" onsubmit="saveNumber(event)">
-                <input type="hidden" id="edit-phone">
-
-                <label>Phone Number</label>
-                <input type="text" id="phone_number" placeholder="+15874059371" required>
-
-                <div class="form-row">
-                    <div>
-                        <label>Business Name</label>
-                        <input type="text" id="business_name" placeholder="ABC Plumbing" required>
-                    </div>
-                    <div>
-                        <label>Business Type</label>
-                        <select id="business_type">
-                            <option value="plumber">Plumber</option>
-                            <option value="hvac">HVAC</option>
-                            <option value="electrician">Electrician</option>
-                            <option value="demo">Demo</option>
-                            <option value="other">Other</option>
-                        </select>
-                    </div>
-                </div>
-
-                <label>Greeting Name (AI introduces as)</label>
-                <input type="text" id="greeting_name" placeholder="Benny" value="Benny">
-
-                <label>System Prompt</label>
-                <select id="system_prompt_id">
-                    <option value="">-- No prompt (use default) --</option>
-                </select>
-
-                <label>Keyword Corrections</label>
-                <select id="keyword_corrections_id">
-                    <option value="">-- No corrections --</option>
-                </select>
-
-                <div class="form-row">
-                    <label>
-                        <input type="checkbox" id="is_demo"> Demo Number (for testing)
-                    </label>
-                    <label>
-                        <input type="checkbox" id="is_active" checked> Active
-                    </label>
-                </div>
-
-                <br><br>
-                <button type="submit" class="btn-success">Save</button>
-            </form>
-        </div>
-    </div>
-
-    <!-- Add/Edit Prompt Modal -->
-    <div id="prompt-modal" class="modal">
-        <div class="modal-content">
-            <span class="close" onclick="closeModal('prompt-modal')">&times;</span>
-            <h2 id="prompt-modal-title">Add Prompt</h2>
-            <form id="prompt-form" onsubmit="savePrompt(event)">
-                <input type="hidden" id="edit-prompt-id">
-
-                <label>Prompt Name</label>
-                <input type="text" id="prompt_name" placeholder="Default Plumber" required>
-
-                <label>Prompt Content</label>
-                <textarea id="prompt_content" rows="15" placeholder="You are {greeting_name}, answering phones for {business_name}...
-
-WHO YOU ARE:
-- Friendly, warm, genuinely helpful
-- You work with {owner_name}
-
-YOUR GOAL:
-Have a real conversation. Listen. Make the caller feel heard.
-
-HOW YOU TALK:
-- Keep responses brief (1-3 sentences)
-- Never give quotes or prices" required></textarea>
-
-                <br>
-                <button type="submit" class="btn-success">Save</button>
-            </form>
-        </div>
-    </div>
-
-    <!-- Add/Edit Keywords Modal -->
-    <div id="keywords-modal" class="modal">
-        <div class="modal-content">
-            <span class="close" onclick="closeModal('keywords-modal')">&times;</span>
-            <h2 id="keywords-modal-title">Add Keyword Set</h2>
-            <form id="keywords-form" onsubmit="saveKeywords(event)">
-                <input type="hidden" id="edit-keywords-id">
-
-                <label>Set Name</label>
-                <input type="text" id="keywords_name" placeholder="Plumbing" required>
-
-                <label>Corrections (JSON format)</label>
-                <textarea id="keywords_corrections" rows="12" placeholder='{
-  "quogged": "clogged",
-  "quarked": "clogged",
-  "fossit": "faucet",
-  "toylet": "toilet"
-}' required></textarea>
-
-                <p style="font-size: 12px; color: #666;">Format: {"misheard": "correct", ...}</p>
-
-                <br>
-                <button type="submit" class="btn-success">Save</button>
-            </form>
-        </div>
-    </div>
-
-    <script>
-        const NUMBERS_API = '/api/numbers';
-        const PROMPTS_API = '/api/prompts';
-        const KEYWORDS_API = '/api/keywords';
-        const TWILIO_API = '/api/twilio';
-        let promptsCache = [];
-        let keywordsCache = [];
-
-        // ============ Tab Navigation ============
-        function showTab(tab) {
-            document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-            document.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));
-            document.querySelector(`.tab[onclick="showTab('${tab}')"]`).classList.add('active');
-            document.getElementById(`${tab}-tab`).classList.add('active');
-        }
-
-        // ============ Numbers ============
-        async function loadNumbers() {
-            const [numbersResp, promptsResp, keywordsResp] = await Promise.all([
-                fetch(NUMBERS_API),
-                fetch(PROMPTS_API),
-                fetch(KEYWORDS_API)
-            ]);
-            const numbers = await numbersResp.json();
-            promptsCache = await promptsResp.json();
-            keywordsCache = await keywordsResp.json();
-
-            // Update prompt dropdown
-            const promptSelect = document.getElementById('system_prompt_id');
-            promptSelect.innerHTML = '<option value="">-- No prompt (use default) --</option>' +
-                promptsCache.map(p => `<option value="${p.id}">${p.name}</option>`).join('');
-
-            // Update keywords dropdown
-            const keywordsSelect = document.getElementById('keyword_corrections_id');
-            keywordsSelect.innerHTML = '<option value="">-- No corrections --</option>' +
-                keywordsCache.map(k => `<option value="${k.id}">${k.name}</option>`).join('');
-
-            const tbody = document.getElementById('numbers-table');
-            if (numbers.length === 0) {
-                tbody.innerHTML = '<tr><td colspan="9" class="empty">No phone numbers configured. Add one to get started.</td></tr>';
-                return;
-            }
-
-            tbody.innerHTML = numbers.map(n => {
-                const prompt = promptsCache.find(p => p.id === n.system_prompt_id);
-                const keywords = keywordsCache.find(k => k.id === n.keyword_corrections_id);
-                return `
-                    <tr>
-                        <td><strong>${n.phone_number}</strong></td>
-                        <td>${n.business_name}</td>
-                        <td><span class="badge badge-type">${n.business_type}</span></td>
-                        <td>${n.greeting_name}</td>
-                        <td>${prompt ? prompt.name : '<em style="color:#999">Default</em>'}</td>
-                        <td>${keywords ? keywords.name : '<em style="color:#999">None</em>'}</td>
-                        <td><span class="badge ${n.is_demo ? 'badge-inactive' : 'badge-type'}">${n.is_demo ? 'Demo' : 'Live'}</span></td>
-                        <td><span class="badge ${n.is_active ? 'badge-active' : 'badge-inactive'}">${n.is_active ? 'Active' : 'Inactive'}</span></td>
-                        <td class="actions">
-                            <button onclick="editNumber('${n.phone_number}')" class="btn-primary">Edit</button>
-                            <button onclick="deleteNumber('${n.phone_number}')" class="btn-danger">Delete</button>
-                        </td>
-                    </tr>
-                `;
-            }).join('');
-        }
-
-        function showAddNumberModal() {
-            document.getElementById('number-modal-title').textContent = 'Add Number';
-            document.getElementById('number-form').reset();
-            document.getElementById('edit-phone').value = '';
-            document.getElementById('phone_number').disabled = false;
-            document.getElementById('is_demo').checked = false;
-            document.getElementById('is_active').checked = true;
-            document.getElementById('number-modal').classList.add('active');
-        }
+# <textarea> content (and placeholders) must stay verbatim
+_VERBATIM_BLOCKS = re.compile(r"(<textarea\b.*?</textarea>)", re.S)
 
-        async function editNumber(phone) {
-            const resp = await fetch(`${NUMBERS_API}/${encodeURIComponent(phone)}`);
-            const n = await resp.json();
-
-            document.getElementById('number-modal-title').textContent = 'Edit Number';
-            document.getElementById('edit-phone').value = phone;
-            document.getElementById('phone_number').value = n.phone_number;
-            document.getElementById('phone_number').disabled = true;
-            document.getElementById('business_name').value = n.business_name;
-            document.getElementById('business_type').value = n.business_type;
-            document.getElementById('greeting_name').value = n.greeting_name;
-            document.getElementById('system_prompt_id').value = n.system_prompt_id || '';
-            document.getElementById('keyword_corrections_id').value = n.keyword_corrections_id || '';
-            document.getElementById('is_demo').checked = n.is_demo;
-            document.getElementById('is_active').checked = n.is_active;
-            document.getElementById('number-modal').classList.add('active');
-        }
 
-        async function saveNumber(e) {
-            e.preventDefault();
-            const editPhone = document.getElementById('edit-phone').value;
-            const isEdit = !!editPhone;
-
-            const promptId = document.getElementById('system_prompt_id').value;
-            const keywordsId = document.getElementById('keyword_corrections_id').value;
-            const data = {
-                phone_number: document.getElementById('phone_number').value,
-                business_name: document.getElementById('business_name').value,
-                business_type: document.getElementById('business_type').value,
-                greeting_name: document.getElementById('greeting_name').value,
-                system_prompt_id: promptId ? parseInt(promptId) : null,
-                keyword_corrections_id: keywordsId ? parseInt(keywordsId) : null,
-                is_demo: document.getElementById('is_demo').checked,
-                is_active: document.getElementById('is_active').checked
-            };
-
-            const url = isEdit ? `${NUMBERS_API}/${encodeURIComponent(editPhone)}` : NUMBERS_API;
-            const method = isEdit ? 'PUT' : 'POST';
-
-            const resp = await fetch(url, {
-                method,
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(data)
-            });
-
-            if (resp.ok) {
-                closeModal('number-modal');
-                loadNumbers();
-            } else {
-                const err = await resp.json();
-                alert(err.detail || 'Error saving number');
-            }
-        }
+def _minify(html: str) -> str:
+    """Collapse whitespace in the admin page without changing how it renders."""
+    parts = []
+    for i, part in enumerate(_VERBATIM_BLOCKS.split(html)):
+        if i % 2 == 0:
+            # Any whitespace run renders as a single space in HTML/CSS
+            parts.append(re.sub(r"\s+", " ", part))
+        else:
+            parts.append(part)
+    return "".join(parts).strip()
 
-        async function deleteNumber(phone) {
-            if (!confirm(`Delete ${phone}?`)) return;
-            const resp = await fetch(`${NUMBERS_API}/${encodeURIComponent(phone)}`, { method: 'DELETE' });
-            if (resp.ok) {
-                loadNumbers();
-            } else {
-                alert('Error deleting number');
-            }
-        }
 
-        // ============ Prompts ============
-        async function loadPrompts() {
-            const resp = await fetch(PROMPTS_API);
-            const prompts = await resp.json();
-            promptsCache = prompts;
+def _minify_js(js: str) -> str:
+    """Strip indentation and blank lines; line breaks stay since `//` comments end at a newline."""
+    return "\n".join(line.strip() for line in js.splitlines() if line.strip())
 
-            const tbody = document.getElementById('prompts-table');
-            if (prompts.length === 0) {
-                tbody.innerHTML = '<tr><td colspan="3" class="empty">No prompts. Add one to get started.</td></tr>';
-                return;
-            }
 
-            tbody.innerHTML = prompts.map(p => `
-                <tr>
-                    <td><strong>${p.name}</strong></td>
-                    <td class="prompt-preview">${p.content.replace(/\\n/g, ' ').substring(0, 100)}...</td>
-                    <td class="actions">
-                        <button onclick="editPrompt(${p.id})" class="btn-primary">Edit</button>
-                        <button onclick="deletePrompt(${p.id}, '${p.name}')" class="btn-danger">Delete</button>
-                    </td>
-                </tr>
-            `).join('');
-        }
-
-        function showAddPromptModal() {
-            document.getElementById('prompt-modal-title').textContent = 'Add Prompt';
-            document.getElementById('prompt-form').reset();
-            document.getElementById('edit-prompt-id').value = '';
-            document.getElementById('prompt-modal').classList.add('active');
-        }
-
-        async function editPrompt(id) {
-            const resp = await fetch(`${PROMPTS_API}/${id}`);
-            const p = await resp.json();
-
-            document.getElementById('prompt-modal-title').textContent = 'Edit Prompt';
-            document.getElementById('edit-prompt-id').value = id;
-            document.getElementById('prompt_name').value = p.name;
-            document.getElementById('prompt_content').value = p.content;
-            document.getElementById('prompt-modal').classList.add('active');
-        }
-
-        async function savePrompt(e) {
-            e.preventDefault();
-            const editId = document.getElementById('edit-prompt-id').value;
-            const isEdit = !!editId;
-
-            const data = {
-                name: document.getElementById('prompt_name').value,
-                content: document.getElementById('prompt_content').value
-            };
-
-            const url = isEdit ? `${PROMPTS_API}/${editId}` : PROMPTS_API;
-            const method = isEdit ? 'PUT' : 'POST';
-
-            const resp = await fetch(url, {
-                method,
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(data)
-            });
-
-            if (resp.ok) {
-                closeModal('prompt-modal');
-                loadPrompts();
-                loadNumbers(); // Refresh to update prompt names
-            } else {
-                const err = await resp.json();
-                alert(err.detail || 'Error saving prompt');
-            }
-        }
-
-        async function deletePrompt(id, name) {
-            if (!confirm(`Delete prompt "${name}"? Numbers using it will revert to default.`)) return;
-            const resp = await fetch(`${PROMPTS_API}/${id}`, { method: 'DELETE' });
-            if (resp.ok) {
-                loadPrompts();
-                loadNumbers();
-            } else {
-                alert('Error deleting prompt');
-            }
-        }
-
-        // ============ Keywords ============
-        async function loadKeywords() {
-            const resp = await fetch(KEYWORDS_API);
-            const keywords = await resp.json();
-            keywordsCache = keywords;
-
-            const tbody = document.getElementById('keywords-table');
-            if (keywords.length === 0) {
-                tbody.innerHTML = '<tr><td colspan="3" class="empty">No keyword sets. Add one to get started.</td></tr>';
-                return;
-            }
-
-            tbody.innerHTML = keywords.map(k => {
-                const count = Object.keys(k.corrections).length;
-                const preview = Object.entries(k.corrections).slice(0, 3)
-                    .map(([wrong, right]) => `${wrong}→${right}`).join(', ');
-                return `
-                    <tr>
-                        <td><strong>${k.name}</strong></td>
-                        <td class="prompt-preview">${count} corrections: ${preview}${count > 3 ? '...' : ''}</td>
-                        <td class="actions">
-                            <button onclick="editKeywords(${k.id})" class="btn-primary">Edit</button>
-                            <button onclick="deleteKeywords(${k.id}, '${k.name}')" class="btn-danger">Delete</button>
-                        </td>
-                    </tr>
-                `;
-            }).join('');
-        }
-
-        function showAddKeywordsModal() {
-            document.getElementById('keywords-modal-title').textContent = 'Add Keyword Set';
-            document.getElementById('keywords-form').reset();
-            document.getElementById('edit-keywords-id').value = '';
-            document.getElementById('keywords-modal').classList.add('active');
-        }
-
-        async function editKeywords(id) {
-            const resp = await fetch(`${KEYWORDS_API}/${id}`);
-            const k = await resp.json();
-
-            document.getElementById('keywords-modal-title').textContent = 'Edit Keyword Set';
-            document.getElementById('edit-keywords-id').value = id;
-            document.getElementById('keywords_name').value = k.name;
-            document.getElementById('keywords_corrections').value = JSON.stringify(k.corrections, null, 2);
-            document.getElementById('keywords-modal').classList.add('active');
-        }
+# ============ Static assets ============
 
-        async function saveKeywords(e) {
-            e.preventDefault();
-            const editId = document.getElementById('edit-keywords-id').value;
-            const isEdit = !!editId;
-
-            let corrections;
-            try {
-                corrections = JSON.parse(document.getElementById('keywords_corrections').value);
-            } catch (err) {
-                alert('Invalid JSON format. Please check the corrections field.');
-                return;
-            }
-
-            const data = {
-                name: document.getElementById('keywords_name').value,
-                corrections: corrections
-            };
-
-            const url = isEdit ? `${KEYWORDS_API}/${editId}` : KEYWORDS_API;
-            const method = isEdit ? 'PUT' : 'POST';
-
-            const resp = await fetch(url, {
-                method,
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(data)
-            });
-
-            if (resp.ok) {
-                closeModal('keywords-modal');
-                loadKeywords();
-                loadNumbers(); // Refresh to update keywords names
-            } else {
-                const err = await resp.json();
-                alert(err.detail || 'Error saving keyword set');
-            }
-        }
-
-        async function deleteKeywords(id, name) {
-            if (!confirm(`Delete keyword set "${name}"? Numbers using it will have no corrections.`)) return;
-            const resp = await fetch(`${KEYWORDS_API}/${id}`, { method: 'DELETE' });
-            if (resp.ok) {
-                loadKeywords();
-                loadNumbers();
-            } else {
-                alert('Error deleting keyword set');
-            }
-        }
-
-        // ============ Twilio Numbers ============
-        async function loadTwilioNumbers() {
-            const tbody = document.getElementById('twilio-numbers-table');
-            tbody.innerHTML = '<tr><td colspan="4" class="empty">Loading...</td></tr>';
-
-            try {
-                const resp = await fetch(`${TWILIO_API}/numbers`);
-                if (!resp.ok) {
-                    const err = await resp.json();
-                    tbody.innerHTML = `<tr><td colspan="4" class="empty">${err.detail || 'Error loading Twilio numbers'}</td></tr>`;
-                    return;
-                }
-
-                const numbers = await resp.json();
-                if (numbers.length === 0) {
-                    tbody.innerHTML = '<tr><td colspan="5" class="empty">No numbers in your Twilio account.</td></tr>';
-                    return;
-                }
-
-                tbody.innerHTML = numbers.map(n => {
-                    const voiceUrl = n.voice_url || '<em style="color:#999">Not configured</em>';
-                    const isConfigured = n.voice_url && n.voice_url.includes('runpod');
-                    const escapedName = (n.friendly_name || '').replace(/'/g, "\\'");
-                    return `
-                        <tr>
-                            <td><strong>${n.phone}</strong></td>
-                            <td>${n.region || '-'}</td>
-                            <td>
-                                <span id="name-${n.sid}">${n.friendly_name || '-'}</span>
-                                <button onclick="editTwilioName('${n.sid}', '${escapedName}')" style="padding: 2px 6px; font-size: 11px; margin-left: 5px;">Edit</button>
-                            </td>
-                            <td style="max-width: 200px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;" title="${n.voice_url || ''}">${voiceUrl}</td>
-                            <td class="actions">
-                                <button onclick="importTwilioNumber('${n.phone}')" class="btn-primary">Import</button>
-                                ${!isConfigured ? `<button onclick="configureTwilioNumber('${n.sid}')" class="btn-success">Set Webhook</button>` : ''}
-                            </td>
-                        </tr>
-                    `;
-                }).join('');
-            } catch (err) {
-                tbody.innerHTML = '<tr><td colspan="5" class="empty">Error connecting to Twilio API</td></tr>';
-            }
-        }
-
-        async function searchTwilioNumbers() {
-            const country = document.getElementById('twilio-country').value;
-            const areaCode = document.getElementById('twilio-area-code').value;
-
-            const resultsDiv = document.getElementById('twilio-search-results');
-            const tbody = document.getElementById('twilio-search-table');
-
-            resultsDiv.style.display = 'block';
-            tbody.innerHTML = '<tr><td colspan="3" class="empty">Searching...</td></tr>';
-
-            try {
-                const resp = await fetch(`${TWILIO_API}/search?country=${country}&area_code=${areaCode}`);
-                if (!resp.ok) {
-                    const err = await resp.json();
-                    tbody.innerHTML = `<tr><td colspan="3" class="empty">${err.detail || 'Error searching numbers'}</td></tr>`;
-                    return;
-                }
-
-                const numbers = await resp.json();
-                if (numbers.length === 0) {
-                    tbody.innerHTML = '<tr><td colspan="3" class="empty">No numbers available in that area code.</td></tr>';
-                    return;
-                }
-
-                tbody.innerHTML = numbers.map(n => `
-                    <tr>
-                        <td><strong>${n.phone}</strong></td>
-                        <td>${n.locality || ''}, ${n.region || ''}</td>
-                        <td class="actions">
-                            <button onclick="buyTwilioNumber('${n.phone}')" class="btn-success">Buy</button>
-                        </td>
-                    </tr>
-                `).join('');
-            } catch (err) {
-                tbody.innerHTML = '<tr><td colspan="3" class="empty">Error connecting to Twilio API</td></tr>';
-            }
-        }
-
-        async function buyTwilioNumber(phone) {
-            if (!confirm(`Purchase ${phone} for ~$1.15 CAD/month?\\n\\nWebhook will be auto-configured to this server.`)) return;
-
-            try {
-                const resp = await fetch(`${TWILIO_API}/buy`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ phone_number: phone })
-                });
-
-                if (resp.ok) {
-                    const result = await resp.json();
-                    alert(`Purchased ${result.phone}!\\n\\nWebhook set to: ${result.voice_url}`);
-                    loadTwilioNumbers();
-                    document.getElementById('twilio-search-results').style.display = 'none';
-                } else {
-                    const err = await resp.json();
-                    alert(err.detail || 'Error purchasing number');
-                }
-            } catch (err) {
-                alert('Error connecting to Twilio API');
-            }
-        }
-
-        async function configureTwilioNumber(sid) {
-            if (!confirm('Configure this number to receive calls on this BuddyHelps server?')) return;
-
-            try {
-                const resp = await fetch(`${TWILIO_API}/configure/${sid}`, { method: 'POST' });
-
-                if (resp.ok) {
-                    const result = await resp.json();
-                    alert(`Configured ${result.phone}!\\n\\nWebhook set to: ${result.voice_url}`);
-                    loadTwilioNumbers();
-                } else {
-                    const err = await resp.json();
-                    alert(err.detail || 'Error configuring number');
-                }
-            } catch (err) {
-                alert('Error connecting to Twilio API');
-            }
-        }
-
-        function importTwilioNumber(phone) {
-            // Pre-fill the add number modal with this phone
-            showAddNumberModal();
-            document.getElementById('phone_number').value = phone;
-        }
-
-        async function editTwilioName(sid, currentName) {
-            const newName = prompt('Enter new friendly name:', currentName);
-            if (newName === null || newName === currentName) return;
-
-            try {
-                const resp = await fetch(`${TWILIO_API}/numbers/${sid}`, {
-                    method: 'PUT',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ friendly_name: newName })
-                });
-
-                if (resp.ok) {
-                    const result = await resp.json();
-                    document.getElementById(`name-${sid}`).textContent = result.friendly_name;
-                } else {
-                    const err = await resp.json();
-                    alert(err.detail || 'Error updating name');
-                }
-            } catch (err) {
-                alert('Error connecting to Twilio API');
-            }
-        }
+# The page shell, CSS and JS live in src/static. CSS/JS are served from
+# memory under content-hashed URLs, so browsers cache them forever and a
+# deploy changes the URL.
+STATIC_DIR = Path(__file__).parent / "static"
+_STATIC_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable",
+    "Vary": "Accept-Encoding",
+}
 
-        // ============ Utils ============
-        function closeModal(modalId) {
-            document.getElementById(modalId).classList.remove('active');
-        }
+# hashed filename -> (media type, body, {encoding: compressed body})
+_static_assets: Dict[str, Tuple[str, bytes, Dict[str, bytes]]] = {}
+
+
+def _precompress(body: bytes) -> Dict[str, bytes]:
+    """Compress once at import, in server preference order (br when installed, then gzip)."""
+    encoded = {}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=11)
+    encoded["gzip"] = gzip.compress(body, 9)
+    return encoded
+
+
+def _encoded_response(
+    request: Request, body: bytes, encoded: Dict[str, bytes], media_type: str, headers: Dict[str, str]
+) -> Response:
+    """Send the best precompressed variant the client accepts, else the identity body."""
+    accepted = {
+        token.split(";")[0].strip()
+        for token in request.headers.get("accept-encoding", "").split(",")
+    }
+    for encoding, payload in encoded.items():
+        if encoding in accepted:
+            return Response(
+                payload,
+                media_type=media_type,
+                headers={**headers, "Content-Encoding": encoding},
+            )
+    return Response(body, media_type=media_type, headers=headers)
+
+
+def _register_asset(name: str, media_type: str, minify: Callable[[str], str]) -> str:
+    """Load, minify and compress a static file; return its hashed URL."""
+    body = minify((STATIC_DIR / name).read_text()).encode("utf-8")
+    stem, ext = name.rsplit(".", 1)
+    hashed = f"{stem}.{hashlib.md5(body).hexdigest()[:12]}.{ext}"
+    _static_assets[hashed] = (media_type, body, _precompress(body))
+    return f"/static/{hashed}"
+
+
+ADMIN_HTML = _minify(
+    (STATIC_DIR / "admin.html").read_text()
+    .replace("__ADMIN_CSS__", _register_asset("admin.css", "text/css", _minify))
+    .replace("__ADMIN_JS__", _register_asset("admin.js", "application/javascript", _minify_js))
+)
+
+
+@router.get("/static/{filename}")
+async def static_asset(filename: str, request: Request):
+    """Serve a hashed admin asset (immutable, precompressed)."""
+    asset = _static_assets.get(filename)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    media_type, body, encoded = asset
+    return _encoded_response(request, body, encoded, media_type, _STATIC_HEADERS)
+
+
+# The page is static, so it is compressed and hashed once at import. The weak
+# ETag covers every encoding of the same content. The shell points at hashed
+# asset URLs, so it gets a short max-age and is then revalidated: a deploy
+# shows up within a minute instead of five.
+_ADMIN_HTML_BODY = ADMIN_HTML.encode("utf-8")
+_ADMIN_HTML_ENCODED = _precompress(_ADMIN_HTML_BODY)
+_ADMIN_HTML_ETAG = f'W/"{hashlib.md5(_ADMIN_HTML_BODY).hexdigest()}"'
+_ADMIN_HTML_HEADERS = {
+    "ETag": _ADMIN_HTML_ETAG,
+    "Cache-Control": "public, max-age=60, must-revalidate",
+    "Vary": "Accept-Encoding",
+}
 
-        // Load on page load
-        loadNumbers();
-        loadPrompts();
-        loadKeywords();
-        loadTwilioNumbers();
-    </script>
-</body>
-</html>
-"""
 
 @router.get("/admin", response_class=HTMLResponse)
-async def admin_ui():
-    """Serve the admin UI."""
-    return ADMIN_HTML
+async def admin_ui(request: Request):
+    """Serve the admin UI (precompressed, revalidated via ETag)."""
+    if request.headers.get("if-none-match") == _ADMIN_HTML_ETAG:
+        return Response(status_code=304, headers=_ADMIN_HTML_HEADERS)
+    return _encoded_response(
+        request, _ADMIN_HTML_BODY, _ADMIN_HTML_ENCODED, "text/html", _ADMIN_HTML_HEADERS
+    )
@@ -6,14 +6,202 @@ Whisper expects: 16kHz, PCM (16-bit signed)
 Kokoro outputs: 24kHz, PCM
 Twilio expects back: 8kHz, mulaw encoded, base64
 """
-import audioop
 import base64
 import io
 import struct
-from typing import Union
+from functools import lru_cache
+from typing import Iterator, List, Union
 
 import numpy as np
 
+try:
+    # SIMD (AVX2/SSSE3/NEON) base64; ~10x the stdlib codec on 20ms frames
+    from pybase64 import b64decode, b64encode_as_string
+except ImportError:  # pybase64 is optional; fall back to the stdlib codec
+    from base64 import b64decode
+
+    def b64encode_as_string(data: bytes) -> str:
+        return base64.b64encode(data).decode('ascii')
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path below is used without it
+    njit = None
+
+
+def _build_mulaw_decode_table() -> np.ndarray:
+    """G.711 mu-law -> 16-bit linear PCM for every possible byte value."""
+    u = ~np.arange(256, dtype=np.uint8)  # mu-law bytes are stored inverted
+    exponent = (u >> 4) & 0x07
+    mantissa = (u & 0x0F).astype(np.int32)
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(u & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+# Decoding a frame is a single table gather instead of a per-byte audioop call
+MULAW_DECODE = _build_mulaw_decode_table()
+
+
+# Largest biased 14-bit magnitude in each mu-law segment (G.711)
+_MULAW_SEGMENT_ENDS = (0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF)
+
+
+def _build_mulaw_encode_table() -> np.ndarray:
+    """16-bit linear PCM -> G.711 mu-law, indexed by the sample's uint16 bit pattern."""
+    pcm = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(pcm), 8159) + 0x21  # clip, then add the bias (0x84 >> 2)
+    segment = np.searchsorted(np.array(_MULAW_SEGMENT_ENDS), magnitude)
+    ulaw = np.where(
+        segment < 8, (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F), 0x7F
+    )
+    return (ulaw ^ mask).astype(np.uint8)
+
+
+# Encoding is the mirror image: one gather per sample into a 64KB table
+MULAW_ENCODE = _build_mulaw_encode_table()
+
+
+def upsample_2x(pcm: np.ndarray) -> np.ndarray:
+    """
+    Double the sample rate of int16 PCM by linear interpolation.
+
+    Even outputs are the input samples, odd outputs the midpoint of each
+    neighbouring pair. The ratio is exact, so no resampler state is needed.
+    """
+    if len(pcm) == 0:
+        return pcm
+    wide = pcm.astype(np.int32)
+    out = np.empty(2 * len(pcm), dtype=np.int16)
+    out[0::2] = pcm
+    out[1:-1:2] = (wide[:-1] + wide[1:]) >> 1
+    out[-1] = pcm[-1]
+    return out
+
+
+def _decode_mulaw_2x_numpy(mulaw: np.ndarray, out: np.ndarray, table: np.ndarray) -> int:
+    """Decode mu-law bytes into out at twice the rate; returns samples written."""
+    n = 2 * len(mulaw)
+    out[:n] = upsample_2x(table[mulaw])
+    return n
+
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _decode_mulaw_2x(mulaw, out, table):
+        """Fused mu-law decode + 2x upsample: one pass, no temporaries."""
+        n = len(mulaw)
+        if n == 0:
+            return 0
+        prev = np.int32(table[mulaw[0]])
+        for i in range(1, n):
+            cur = np.int32(table[mulaw[i]])
+            out[2 * i - 2] = prev
+            out[2 * i - 1] = (prev + cur) >> 1
+            prev = cur
+        out[2 * n - 2] = prev
+        out[2 * n - 1] = prev
+        return 2 * n
+
+    # Compile (or load from the on-disk cache) now rather than on a live call.
+    # Live input is np.frombuffer over bytes, i.e. a read-only array, which
+    # numba types separately from a writable one, so warm with the same.
+    _decode_mulaw_2x(np.frombuffer(bytes(2), np.uint8), np.empty(4, np.int16), MULAW_DECODE)
+else:
+    _decode_mulaw_2x = _decode_mulaw_2x_numpy
+
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _encode_mulaw(pcm, out):
+        """
+        Branchless G.711 encode (audioop-compatible), computed in registers.
+
+        Small frames stay in L1 without pulling in the 64KB MULAW_ENCODE.
+        The segment is a count of comparisons against the segment ends.
+        """
+        for i in range(len(pcm)):
+            x = np.int32(pcm[i]) >> 2
+            sign = x >> 31                        # 0 or -1
+            magnitude = min((x ^ sign) - sign, 8159) + 0x21
+            segment = 0
+            for bound in _MULAW_SEGMENT_ENDS:
+                segment += magnitude > bound
+            ulaw = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+            ulaw = min(ulaw, 0x7F)                # segment 8 (clipped) -> 0x7F
+            out[i] = ulaw ^ (0xFF + (sign << 7))  # mask: 0xFF positive, 0x7F negative
+        return out
+
+    # Warm both input layouts pcm_to_mulaw8k produces: read-only frombuffer
+    # views (8kHz passthrough) and writable arrays (decimate, resample).
+    # numba compiles each separately.
+    _encode_mulaw(np.frombuffer(bytes(4), np.int16), np.empty(2, np.uint8))
+    _encode_mulaw(np.zeros(2, np.int16), np.empty(2, np.uint8))
+
+    def encode_mulaw(pcm: np.ndarray) -> np.ndarray:
+        """int16 PCM -> mu-law bytes."""
+        return _encode_mulaw(pcm, np.empty(len(pcm), dtype=np.uint8))
+else:
+    def encode_mulaw(pcm: np.ndarray) -> np.ndarray:
+        """int16 PCM -> mu-law bytes."""
+        return MULAW_ENCODE[pcm.view(np.uint16)]
+
+
+def kernel_info() -> str:
+    """
+    Describe the active mu-law kernels for the startup log.
+
+    Numba compiles for the host CPU (its -march=native equivalent), so the
+    SIMD width follows whatever pod this runs on; cache=True stores one
+    build per CPU model, so a pod on new hardware compiles once at import.
+    """
+    if njit is None:
+        return "numpy (numba not installed)"
+    from llvmlite import binding  # numba's LLVM bindings; present with numba
+    return f"numba, host CPU {binding.get_host_cpu_name()}"
+
+
+def decode_mulaw_16k_into(mulaw_bytes: bytes, out: np.ndarray) -> int:
+    """
+    Decode 8kHz mu-law into a caller-owned 16kHz int16 buffer.
+
+    out must hold at least 2 * len(mulaw_bytes) samples. Returns the number
+    of samples written.
+    """
+    mulaw = np.frombuffer(mulaw_bytes, dtype=np.uint8)
+    return _decode_mulaw_2x(mulaw, out, MULAW_DECODE)
+
+
+@lru_cache(maxsize=None)
+def _decimation_taps(factor: float, num_taps: int = 31) -> np.ndarray:
+    """Hamming-windowed sinc low-pass at 90% of the output Nyquist."""
+    cutoff = 0.45 / factor  # fraction of the input sample rate
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(num_taps)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+def decimate(pcm: np.ndarray, factor: int) -> np.ndarray:
+    """Low-pass then keep every factor-th sample of int16 PCM (e.g. 24k -> 8k for factor 3)."""
+    filtered = np.convolve(pcm.astype(np.float32), _decimation_taps(factor), mode="same")
+    return np.clip(np.rint(filtered[::factor]), -32768, 32767).astype(np.int16)
+
+
+def resample(pcm: np.ndarray, input_rate: int, output_rate: int) -> np.ndarray:
+    """
+    Resample int16 PCM by any ratio: low-pass (when downsampling), then
+    linearly interpolate at the output sample times. For rates without an
+    exact integer ratio; use decimate() / upsample_2x() when there is one.
+    """
+    if len(pcm) == 0:
+        return pcm
+    signal = pcm.astype(np.float32)
+    if output_rate < input_rate:
+        signal = np.convolve(signal, _decimation_taps(input_rate / output_rate), mode="same")
+    times = np.arange(len(pcm) * output_rate // input_rate) * (input_rate / output_rate)
+    resampled = np.interp(times, np.arange(len(pcm)), signal)
+    return np.clip(np.rint(resampled), -32768, 32767).astype(np.int16)
+
 
 def mulaw_to_pcm16k(mulaw_base64: str) -> bytes:
     """
@@ -23,16 +211,60 @@ def mulaw_to_pcm16k(mulaw_base64: str) -> bytes:
     Output: 16kHz 16-bit PCM bytes
     """
     # Decode base64
-    mulaw_bytes = base64.b64decode(mulaw_base64)
+    mulaw_bytes = b64decode(mulaw_base64)
+
+    # Convert mulaw to linear PCM (16-bit, native byte order like audioop)
+    # and resample 8kHz -> 16kHz (whisper expects 16kHz) in one step
+    out = np.empty(2 * len(mulaw_bytes), dtype=np.int16)
+    decode_mulaw_16k_into(mulaw_bytes, out)
+    return out.tobytes()
+
+
+class MulawStreamDecoder:
+    """
+    Decode one call's Twilio frames as a continuous 16kHz stream.
+
+    Decoding each frame on its own (mulaw_to_pcm16k) repeats the last
+    sample at every 20ms seam, since the next frame isn't known yet. This
+    holds that last sample back instead and emits it, interpolated towards
+    its successor, at the start of the next batch, so the output equals
+    upsampling the whole call in one go (delayed by one sample).
+    """
+
+    def __init__(self):
+        self._pending: Union[int, None] = None  # last 8kHz sample, not yet emitted
 
-    # Convert mulaw to linear PCM (16-bit)
-    # audioop.ulaw2lin returns bytes in native byte order
-    pcm_8k = audioop.ulaw2lin(mulaw_bytes, 2)  # 2 = 16-bit samples
+    def decode(self, payloads: List[str]) -> List[memoryview]:
+        """
+        Decode a run of queued frames; the table gather and interpolation
+        run once over all of them.
+
+        Input: base64 encoded 8kHz mulaw frames
+        Output: 16kHz 16-bit PCM per frame, as byte views into one shared
+            buffer. Each view is shifted one 8kHz sample earlier than its
+            frame (the held-back sample leads the first one).
+        """
+        parts = [b64decode(payload) for payload in payloads]
+        pcm = MULAW_DECODE[np.frombuffer(b"".join(parts), dtype=np.uint8)].astype(np.int32)
+        lengths = np.fromiter((len(part) for part in parts), dtype=np.int64, count=len(parts))
+        ends = np.cumsum(lengths)
 
-    # Resample 8kHz -> 16kHz (whisper expects 16kHz)
-    pcm_16k, _ = audioop.ratecv(pcm_8k, 2, 1, 8000, 16000, None)
+        # Sample i of seq is emitted as itself plus the midpoint towards
+        # sample i + 1; the final one waits for the next batch
+        offset = 0 if self._pending is None else 1
+        seq = pcm if offset == 0 else np.concatenate(([self._pending], pcm))
+        if len(seq):
+            self._pending = int(seq[-1])
 
-    return pcm_16k
+        pairs = max(len(seq) - 1, 0)
+        out = np.empty(2 * pairs, dtype=np.int16)
+        out[0::2] = seq[:pairs]
+        out[1::2] = (seq[:pairs] + seq[1:pairs + 1]) >> 1
+
+        view = memoryview(out).cast("B")
+        his = np.maximum(ends + (offset - 1), 0)
+        los = np.concatenate(([0], his[:-1]))
+        return [view[4 * lo:4 * hi] for lo, hi in zip(los.tolist(), his.tolist())]
 
 
 def pcm_to_mulaw8k(pcm_bytes: bytes, input_rate: int = 24000) -> str:
@@ -42,37 +274,47 @@ def pcm_to_mulaw8k(pcm_bytes: bytes, input_rate: int = 24000) -> str:
     Input: PCM bytes at input_rate (default 24kHz from Kokoro)
     Output: base64 encoded 8kHz mulaw
     """
-    # Resample to 8kHz
-    if input_rate != 8000:
-        pcm_8k, _ = audioop.ratecv(pcm_bytes, 2, 1, input_rate, 8000, None)
+    # Resample to 8kHz (Kokoro's 24kHz is an exact 3:1 decimation)
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16, count=len(pcm_bytes) // 2)
+    if input_rate == 8000:
+        pcm_8k = samples
+    elif input_rate % 8000 == 0:
+        pcm_8k = decimate(samples, input_rate // 8000)
     else:
-        pcm_8k = pcm_bytes
+        pcm_8k = resample(samples, input_rate, 8000)
 
     # Convert PCM to mulaw
-    mulaw_bytes = audioop.lin2ulaw(pcm_8k, 2)
+    mulaw_bytes = encode_mulaw(pcm_8k).tobytes()
 
     # Encode as base64
-    return base64.b64encode(mulaw_bytes).decode('ascii')
+    return b64encode_as_string(mulaw_bytes)
 
 
-def pcm_to_wav_bytes(pcm_bytes: bytes, sample_rate: int = 16000) -> bytes:
+def pcm_bytes_to_float32(pcm_bytes: bytes) -> np.ndarray:
     """
-    Wrap PCM bytes in a WAV header for processing.
+    Convert 16-bit PCM bytes to float32 samples in [-1, 1).
 
-    Useful for passing to whisper which expects WAV format.
+    This is the layout faster-whisper takes directly, so STT can skip the
+    WAV wrap, the temp file and the decode on the other side.
     """
-    # WAV header for mono 16-bit PCM
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16, count=len(pcm_bytes) // 2)
+    out = samples.astype(np.float32)
+    out *= 1.0 / 32768.0
+    return out
+
+
+@lru_cache(maxsize=4)
+def _wav_header_template(sample_rate: int) -> bytes:
+    """44-byte mono 16-bit PCM WAV header with zeroed size fields (offsets 4 and 40)."""
     num_channels = 1
     bits_per_sample = 16
     byte_rate = sample_rate * num_channels * bits_per_sample // 8
     block_align = num_channels * bits_per_sample // 8
-    data_size = len(pcm_bytes)
 
-    # Build WAV header (44 bytes)
-    header = struct.pack(
+    return struct.pack(
         '<4sI4s4sIHHIIHH4sI',
         b'RIFF',
-        36 + data_size,  # File size - 8
+        0,   # File size - 8 (patched per call)
         b'WAVE',
         b'fmt ',
         16,  # Subchunk1 size (PCM)
@@ -83,13 +325,27 @@ def pcm_to_wav_bytes(pcm_bytes: bytes, sample_rate: int = 16000) -> bytes:
         block_align,
         bits_per_sample,
         b'data',
-        data_size
+        0    # Data size (patched per call)
     )
 
-    return header + pcm_bytes
 
+def pcm_to_wav_bytes(pcm_bytes: bytes, sample_rate: int = 16000) -> bytes:
+    """
+    Wrap PCM bytes in a WAV header for processing.
 
-def chunk_audio_for_streaming(audio_bytes: bytes, chunk_size: int = 640) -> list:
+    Useful for passing to whisper which expects WAV format.
+    """
+    data_size = len(pcm_bytes)
+
+    # Patch the two size fields into a copy of the cached header
+    header = bytearray(_wav_header_template(sample_rate))
+    struct.pack_into('<I', header, 4, 36 + data_size)
+    struct.pack_into('<I', header, 40, data_size)
+
+    return bytes(header) + pcm_bytes
+
+
+def chunk_audio_for_streaming(audio_bytes: bytes, chunk_size: int = 640) -> Iterator[str]:
     """
     Split audio into chunks for streaming back to Twilio.
 
@@ -100,14 +356,13 @@ def chunk_audio_for_streaming(audio_bytes: bytes, chunk_size: int = 640) -> list
         audio_bytes: Raw mulaw bytes (not base64)
         chunk_size: Bytes per chunk (640 = 40ms at 8kHz mulaw)
 
-    Returns:
-        List of base64-encoded chunks
+    Yields:
+        Base64-encoded chunks, encoded lazily as the sender consumes them
     """
-    chunks = []
-    for i in range(0, len(audio_bytes), chunk_size):
-        chunk = audio_bytes[i:i + chunk_size]
-        chunks.append(base64.b64encode(chunk).decode('ascii'))
-    return chunks
+    # memoryview slices share the buffer; only the base64 output is allocated
+    view = memoryview(audio_bytes)
+    for i in range(0, len(view), chunk_size):
+        yield b64encode_as_string(view[i:i + chunk_size])
 
 
 class AudioBuffer:
@@ -124,39 +379,62 @@ class AudioBuffer:
             min_duration_ms: Minimum audio duration before processing.
                             500ms = reasonable for voice activity.
         """
-        self.buffer = bytearray()
         self.min_samples = int(16000 * min_duration_ms / 1000)  # At 16kHz
+        # Preallocated 16kHz accumulator that frames are decoded straight
+        # into. It is drained as soon as min_samples is reached, so it only
+        # needs room for that plus one frame (grown if a frame is larger).
+        self.samples = np.empty(self.min_samples + 640, dtype=np.int16)
+        self.length = 0
 
-    def add_chunk(self, mulaw_base64: str) -> Union[bytes, None]:
+    def add_chunk(self, mulaw_base64: str) -> Union[memoryview, None]:
         """
         Add a chunk and return accumulated audio if ready.
 
         Returns:
-            PCM bytes (16kHz) if buffer is full, else None
+            PCM bytes view (16kHz) if buffer is full, else None
         """
-        # Convert and add to buffer
-        pcm = mulaw_to_pcm16k(mulaw_base64)
-        self.buffer.extend(pcm)
-
-        # Check if we have enough (2 bytes per sample at 16-bit)
-        if len(self.buffer) >= self.min_samples * 2:
-            audio = bytes(self.buffer)
-            self.buffer.clear()
-            return audio
+        mulaw_bytes = b64decode(mulaw_base64)
+        needed = self.length + 2 * len(mulaw_bytes)
+        if needed > len(self.samples):
+            grown = np.empty(needed, dtype=np.int16)
+            grown[:self.length] = self.samples[:self.length]
+            self.samples = grown
+        written = decode_mulaw_16k_into(mulaw_bytes, self.samples[self.length:])
+        if self.length and written:
+            # Each frame is upsampled on its own, so the previous frame ends on
+            # a repeated sample. Now that its successor is known, replace it
+            # with the midpoint so the seam interpolates like one long stream.
+            last = self.length - 1
+            self.samples[last] = (int(self.samples[last - 1]) + int(self.samples[self.length])) >> 1
+        self.length += written
+
+        if self.length >= self.min_samples:
+            return self._drain()
 
         return None
 
-    def flush(self) -> Union[bytes, None]:
+    def _drain(self) -> memoryview:
+        """
+        Hand out the accumulated audio without copying it.
+
+        The caller keeps the current array (through the returned view) and
+        later frames go into a fresh, uninitialized one, so the view is
+        never overwritten.
+        """
+        audio = memoryview(self.samples[:self.length]).cast("B")
+        self.samples = np.empty(self.min_samples + 640, dtype=np.int16)
+        self.length = 0
+        return audio
+
+    def flush(self) -> Union[memoryview, None]:
         """Return any remaining audio in buffer."""
-        if len(self.buffer) > 0:
-            audio = bytes(self.buffer)
-            self.buffer.clear()
-            return audio
+        if self.length > 0:
+            return self._drain()
         return None
 
     def clear(self):
         """Clear the buffer."""
-        self.buffer.clear()
+        self.length = 0
 
 
 def detect_speech_end(pcm_bytes: bytes, threshold: float = 500, min_silence_ms: int = 700) -> bool:
@@ -176,10 +454,11 @@ def detect_speech_end(pcm_bytes: bytes, threshold: float = 500, min_silence_ms:
     if len(pcm_bytes) < 2:
         return True
 
-    # Convert to numpy array
-    samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16, count=len(pcm_bytes) // 2)
 
-    # Calculate RMS
-    rms = np.sqrt(np.mean(samples.astype(np.float32) ** 2))
+    # Compare the sum of squares against threshold^2 * n instead of taking
+    # the RMS: exact integer math, no float temporary and no sqrt. int64
+    # accumulation because int32 overflows after ~2 full-scale samples.
+    sum_squares = int(np.einsum("i,i->", samples, samples, dtype=np.int64))
 
-    return rms < threshold
+    return sum_squares < threshold * threshold * samples.size
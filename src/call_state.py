@@ -4,14 +4,23 @@ Call state management for active calls.
 Tracks conversation history, transcripts, and business config for each active call.
 """
 import logging
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from enum import Enum
 
+from .stt_corrections import KeywordCorrector
+
 logger = logging.getLogger(__name__)
 
 
+# Transcript roles, stored as small ints; the tables below are indexed by them
+ROLE_CUSTOMER = 0
+ROLE_ASSISTANT = 1
+_CHAT_ROLES = ("user", "assistant")        # LLM message role
+_TRANSCRIPT_LABELS = ("Customer", "Benny")  # format_transcript() speaker label
+
+
 class CallStatus(Enum):
     """Call lifecycle states."""
     RINGING = "ringing"
@@ -20,9 +29,9 @@ class CallStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class CallState:
-    """State for a single active call."""
+    """State for a single active call (slotted: no per-instance __dict__)."""
 
     # Twilio identifiers
     call_sid: str
@@ -37,61 +46,58 @@ class CallState:
     owner_name: str = ""
     greeting_name: str = "Benny"
     system_prompt: Optional[str] = None
-    keyword_corrections: Dict[str, str] = field(default_factory=dict)
+    keyword_corrections: Union[Dict[str, str], KeywordCorrector] = field(default_factory=dict)
     plumber_phone: str = ""      # For SMS notification
     plumber_email: str = ""      # For email notification
     is_demo: bool = False
 
     # Conversation state
-    conversation_history: List[Dict[str, str]] = field(default_factory=list)
     status: CallStatus = CallStatus.RINGING
 
-    # Transcript (for post-call processing)
-    transcript: List[Dict] = field(default_factory=list)
+    # Transcript: (role, text, time.time_ns()) per message. Tuples instead of
+    # dicts; the LLM's message dicts are built from it per turn.
+    transcript: List[Tuple[int, str, int]] = field(default_factory=list)
 
-    # Timing
-    started_at: datetime = field(default_factory=datetime.utcnow)
-    answered_at: Optional[datetime] = None
-    ended_at: Optional[datetime] = None
+    # Timing (epoch nanoseconds from time.time_ns(); formatted only when read)
+    started_at: int = field(default_factory=time.time_ns)
+    answered_at: Optional[int] = None
+    ended_at: Optional[int] = None
 
     # Audio state
     is_speaking: bool = False    # Is AI currently speaking?
     pending_audio: List[str] = field(default_factory=list)  # Queued TTS chunks
 
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """Conversation as LLM chat messages [{"role": ..., "content": ...}]."""
+        return [
+            {"role": _CHAT_ROLES[role], "content": text}
+            for role, text, _ in self.transcript
+        ]
+
     def add_user_message(self, text: str):
         """Add user (customer) message to conversation."""
-        self.conversation_history.append({"role": "user", "content": text})
-        self.transcript.append({
-            "role": "customer",
-            "text": text,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        self.transcript.append((ROLE_CUSTOMER, text, time.time_ns()))
         logger.debug(f"[{self.call_sid}] Customer: {text}")
 
     def add_assistant_message(self, text: str):
         """Add assistant (AI) message to conversation."""
-        self.conversation_history.append({"role": "assistant", "content": text})
-        self.transcript.append({
-            "role": "assistant",
-            "text": text,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        self.transcript.append((ROLE_ASSISTANT, text, time.time_ns()))
         logger.debug(f"[{self.call_sid}] Assistant: {text}")
 
     def get_duration_seconds(self) -> float:
         """Get call duration in seconds."""
-        end = self.ended_at or datetime.utcnow()
+        end = self.ended_at or time.time_ns()
         if self.answered_at:
-            return (end - self.answered_at).total_seconds()
+            return (end - self.answered_at) / 1e9
         return 0.0
 
     def format_transcript(self) -> str:
         """Format transcript for storage/display."""
-        lines = []
-        for entry in self.transcript:
-            role = "Customer" if entry["role"] == "customer" else "Benny"
-            lines.append(f"{role}: {entry['text']}")
-        return "\n".join(lines)
+        return "\n".join(
+            f"{_TRANSCRIPT_LABELS[role]}: {text}"
+            for role, text, _ in self.transcript
+        )
 
 
 class CallStateManager:
@@ -99,7 +105,7 @@ class CallStateManager:
 
     def __init__(self):
         self._calls: Dict[str, CallState] = {}  # Keyed by call_sid
-        self._stream_to_call: Dict[str, str] = {}  # stream_sid -> call_sid
+        self._by_stream: Dict[str, CallState] = {}  # stream_sid -> same CallState objects
 
     def create_call(self, call_sid: str, twilio_number: str, caller_number: str) -> CallState:
         """Create a new call state."""
@@ -117,18 +123,15 @@ class CallStateManager:
         return self._calls.get(call_sid)
 
     def get_call_by_stream(self, stream_sid: str) -> Optional[CallState]:
-        """Get call state by stream SID."""
-        call_sid = self._stream_to_call.get(stream_sid)
-        if call_sid:
-            return self._calls.get(call_sid)
-        return None
+        """Get call state by stream SID (one lookup; used per media frame)."""
+        return self._by_stream.get(stream_sid)
 
     def register_stream(self, stream_sid: str, call_sid: str):
         """Associate a stream SID with a call SID."""
-        self._stream_to_call[stream_sid] = call_sid
         call = self._calls.get(call_sid)
         if call:
             call.stream_sid = stream_sid
+            self._by_stream[stream_sid] = call
         logger.debug(f"Registered stream {stream_sid} for call {call_sid}")
 
     def end_call(self, call_sid: str) -> Optional[CallState]:
@@ -136,7 +139,7 @@ class CallStateManager:
         call = self._calls.get(call_sid)
         if call:
             call.status = CallStatus.COMPLETED
-            call.ended_at = datetime.utcnow()
+            call.ended_at = time.time_ns()
             logger.info(f"Call ended: {call_sid}, duration: {call.get_duration_seconds():.1f}s")
         return call
 
@@ -144,7 +147,7 @@ class CallStateManager:
         """Remove call from active calls (after post-processing)."""
         call = self._calls.pop(call_sid, None)
         if call and call.stream_sid:
-            self._stream_to_call.pop(call.stream_sid, None)
+            self._by_stream.pop(call.stream_sid, None)
         logger.debug(f"Removed call state: {call_sid}")
 
     def get_active_count(self) -> int:
@@ -2,6 +2,8 @@
 BuddyHelps Voice Server Configuration
 """
 import os
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 
 
@@ -25,7 +27,19 @@ class Settings(BaseSettings):
     whisper_compute_type: str = "float16"  # float16, int8_float16, int8
     whisper_device: str = "cuda"
 
+    # Persistent cache for Inductor/Triton kernels (survives container restarts)
+    compile_cache_dir: str = "/workspace/.cache"
+
+    # Warmup verification: each model must serve a request within its SLO
+    # before the readiness file is written
+    ready_file: str = "/tmp/ready"
+    warmup_slo_stt_ms: float = 500.0
+    warmup_slo_llm_ms: float = 1000.0
+    warmup_slo_tts_ms: float = 1000.0
+
     # LLM settings
+    llm_quant: str = ""  # "" (fp16), "int8" (bitsandbytes), "int4"/"fp8" (torchao; fp8 needs Ada/Hopper)
+    llm_compile: bool = False  # torch.compile(mode="reduce-overhead"); slow first boot
     llm_max_tokens: int = 256
     llm_temperature: float = 0.7
 
@@ -55,4 +69,15 @@ class Settings(BaseSettings):
         extra = "ignore"  # Allow extra env vars without error
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    The process-wide Settings, parsed from env/.env on first use.
+
+    Modules bind `settings` (and admin.py some values derived from it) at
+    import, so env changes after import are not picked up.
+    """
+    return Settings()
+
+
+settings = get_settings()
@@ -4,17 +4,68 @@ Stored on /workspace for persistence across pod restarts.
 """
 import sqlite3
 import os
-import json
+import orjson
+import threading
+import time
 from datetime import datetime
-from typing import Optional, List, Dict
+from itertools import combinations
+from typing import Optional, List, Dict, Tuple
 from contextlib import contextmanager
 
+from .stt_corrections import KeywordCorrector
+
 # Use /workspace in RunPod (persistent), fallback to local for dev
 DB_PATH = "/workspace/buddyhelps.db" if os.path.exists("/workspace") else "buddyhelps.db"
 
+# Keyword set seeded as "Plumbing" on first init, serialized once here
+DEFAULT_PLUMBING_CORRECTIONS = {
+    "quogged": "clogged", "quarked": "clogged", "corked": "clogged",
+    "clocked": "clogged", "cloged": "clogged", "clagged": "clogged",
+    "leek": "leak", "leke": "leak",
+    "drane": "drain", "drayne": "drain",
+    "fossit": "faucet", "fausit": "faucet", "fosset": "faucet",
+    "toylet": "toilet", "tolet": "toilet",
+    "plumer": "plumber", "plummer": "plumber"
+}
+_DEFAULT_PLUMBING_CORRECTIONS_JSON = orjson.dumps(DEFAULT_PLUMBING_CORRECTIONS).decode()
+
+# One long-lived connection per thread (sqlite3 connections can't be shared
+# across threads). Reusing it skips the open() per query and keeps each
+# statement prepared in the connection's statement cache between calls.
+_local = threading.local()
+
+# Every per-thread connection, so close_all() can close them at shutdown
+# (the last close checkpoints the WAL back into the database file)
+_connections: List[sqlite3.Connection] = []
+_connections_lock = threading.Lock()
+
+# get_config_for_call() results by number: (fetched_at, config or None).
+# Every inbound call does this lookup and numbers rarely change, so calls
+# within the TTL skip SQLite entirely. Writes below drop affected entries.
+CONFIG_CACHE_TTL = 60.0
+_config_cache: Dict[str, tuple] = {}
+# Bumped by every invalidation. A lookup only stores its result if no write
+# happened while it was querying, so a slow read can't re-cache stale data.
+_config_generation = 0
+_config_lock = threading.Lock()
+
+def invalidate_config(phone_number: Optional[str] = None):
+    """Drop one number's cached config, or all of them (prompt/keyword edits)."""
+    global _config_generation
+    with _config_lock:
+        _config_generation += 1
+        if phone_number is None:
+            _config_cache.clear()
+        else:
+            _config_cache.pop(phone_number, None)
+
 def init_db():
     """Initialize database and create tables if they don't exist."""
     with get_db() as conn:
+        # WAL lets call-path reads run alongside admin writes. The journal
+        # mode is stored in the database file, so setting it once is enough.
+        conn.execute("PRAGMA journal_mode=WAL")
+
         # System prompts table (reusable templates)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS system_prompts (
@@ -65,13 +116,21 @@ def init_db():
             )
         """)
 
+        # Covering index for get_config_for_call(): the lookup and every
+        # phone_numbers column it reads, so the row itself is never fetched
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_phone_numbers_call_config ON phone_numbers (
+                phone_number, is_active, system_prompt_id, keyword_corrections_id,
+                business_name, business_type, greeting_name, is_demo
+            )
+        """)
+
         # Insert default prompts if none exist
         cursor = conn.execute("SELECT COUNT(*) FROM system_prompts")
         if cursor.fetchone()[0] == 0:
-            # Default basic prompt
-            conn.execute("""
-                INSERT INTO system_prompts (name, content) VALUES (?, ?)
-            """, ("Default Plumber", """You are {greeting_name}, answering phones for {business_name}, a plumbing company.
+            default_prompts = [
+                # Default basic prompt
+                ("Default Plumber", """You are {greeting_name}, answering phones for {business_name}, a plumbing company.
 
 WHO YOU ARE:
 - Friendly, warm, genuinely helpful
@@ -87,12 +146,10 @@ HOW YOU TALK:
 - Keep responses conversational, not scripted
 - Never give quotes or prices - that's {owner_name}'s job
 
-Keep responses brief (1-3 sentences). This is a phone conversation."""))
+Keep responses brief (1-3 sentences). This is a phone conversation."""),
 
-            # Demo Mode prompt - for plumbers testing the system
-            conn.execute("""
-                INSERT INTO system_prompts (name, content) VALUES (?, ?)
-            """, ("Demo Mode", """You are {greeting_name}, demonstrating an AI phone assistant for plumbers.
+                # Demo Mode prompt - for plumbers testing the system
+                ("Demo Mode", """You are {greeting_name}, demonstrating an AI phone assistant for plumbers.
 
 THIS IS A DEMO CALL. The person calling is a plumber testing the system. They will pretend to be a customer with a plumbing problem.
 
@@ -108,12 +165,10 @@ DURING ROLEPLAY: Treat their fake problem like a real call:
 
 AFTER ROLEPLAY: Say "That's how I'd handle it for your customers. When you're ready, book a call at bennyhelps.ca"
 
-Keep responses SHORT (1-2 sentences). Sound natural, not scripted."""))
+Keep responses SHORT (1-2 sentences). Sound natural, not scripted."""),
 
-            # Live Plumbing prompt - for real customer service calls
-            conn.execute("""
-                INSERT INTO system_prompts (name, content) VALUES (?, ?)
-            """, ("Live Plumbing", """You are {greeting_name}, answering after-hours calls for {business_name}.
+                # Live Plumbing prompt - for real customer service calls
+                ("Live Plumbing", """You are {greeting_name}, answering after-hours calls for {business_name}.
 
 YOUR JOB: Collect info about their plumbing problem so {owner_name} can call them back.
 
@@ -133,40 +188,127 @@ HOW TO TALK:
 
 END THE CALL: Confirm their number. Say {owner_name} will call back within the hour (or in the morning if late).
 
-Keep responses SHORT (1-2 sentences). This is a phone call, not a chat."""))
+Keep responses SHORT (1-2 sentences). This is a phone call, not a chat."""),
+            ]
+            conn.executemany(
+                "INSERT INTO system_prompts (name, content) VALUES (?, ?)",
+                default_prompts,
+            )
 
         # Insert default keyword corrections if none exist
         cursor = conn.execute("SELECT COUNT(*) FROM keyword_corrections")
         if cursor.fetchone()[0] == 0:
-            plumbing_corrections = {
-                "quogged": "clogged", "quarked": "clogged", "corked": "clogged",
-                "clocked": "clogged", "cloged": "clogged", "clagged": "clogged",
-                "leek": "leak", "leke": "leak",
-                "drane": "drain", "drayne": "drain",
-                "fossit": "faucet", "fausit": "faucet", "fosset": "faucet",
-                "toylet": "toilet", "tolet": "toilet",
-                "plumer": "plumber", "plummer": "plumber"
-            }
             conn.execute("""
                 INSERT INTO keyword_corrections (name, corrections) VALUES (?, ?)
-            """, ("Plumbing", json.dumps(plumbing_corrections)))
+            """, ("Plumbing", _DEFAULT_PLUMBING_CORRECTIONS_JSON))
 
         conn.commit()
 
+        # Refresh planner statistics (sqlite_stat1) so the JOIN picks the index
+        conn.execute("ANALYZE")
+
 @contextmanager
 def get_db():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Context manager for this thread's database connection."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        # check_same_thread=False only so close_all() may close it from the
+        # shutdown thread; queries still only run on the owning thread.
+        # cached_statements: room for every distinct statement here plus the
+        # per-field-set UPDATEs, so none of them is evicted and re-prepared.
+        conn = _local.conn = sqlite3.connect(
+            DB_PATH, check_same_thread=False, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        with _connections_lock:
+            _connections.append(conn)
+        # Per-connection settings. NORMAL is durable under WAL except for the
+        # last commits on power loss; fsync happens at checkpoints only.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")      # 64MB page cache (negative = KiB)
+        conn.execute("PRAGMA mmap_size=268435456")    # read pages via 256MB mmap, not read()
+        conn.execute("PRAGMA busy_timeout=5000")      # wait out a concurrent writer
     try:
         yield conn
-    finally:
-        conn.close()
+    except BaseException:
+        # The connection outlives this block; don't leave a half-done write open on it
+        conn.rollback()
+        raise
+
+def close_all():
+    """Close every thread's connection (server shutdown)."""
+    with _connections_lock:
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
+    # Threads that query after this reopen a fresh connection
+    global _local
+    _local = threading.local()
+
+# RETURNING needs SQLite 3.35+; older builds fetch the new row by rowid
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_RETURNING = " RETURNING *" if SQLITE_HAS_RETURNING else ""
+
+def _insert(conn: sqlite3.Connection, table: str, sql: str, params) -> sqlite3.Row:
+    """Run an INSERT built with _RETURNING and return the new row."""
+    cursor = conn.execute(sql, params)
+    if SQLITE_HAS_RETURNING:
+        return cursor.fetchone()
+    return conn.execute(
+        f"SELECT * FROM {table} WHERE rowid = ?", (cursor.lastrowid,)
+    ).fetchone()
+
+def _update(
+    conn: sqlite3.Connection, table: str, key_column: str, sql: str, values: list
+) -> Optional[sqlite3.Row]:
+    """Run an UPDATE from _update_statements(); the updated row, or None if no match."""
+    cursor = conn.execute(sql, values)
+    if SQLITE_HAS_RETURNING:
+        return cursor.fetchone()
+    if cursor.rowcount == 0:
+        return None
+    return conn.execute(
+        f"SELECT * FROM {table} WHERE {key_column} = ?", (values[-1],)
+    ).fetchone()
+
+def _update_statements(
+    table: str, key_column: str, columns: Tuple[str, ...]
+) -> Dict[frozenset, Tuple[str, Tuple[str, ...]]]:
+    """
+    UPDATE ... (RETURNING * where supported) for every non-empty subset of
+    columns, keyed by frozenset(subset) -> (sql, subset in SET order). Built
+    at import, so a given set of fields always maps to the same SQL text
+    (and the same cached prepared statement) whatever order the caller
+    passed them in. Run them with _update().
+    """
+    statements = {}
+    for size in range(1, len(columns) + 1):
+        for fields in combinations(columns, size):
+            set_clause = ", ".join(f"{k} = ?" for k in fields)
+            statements[frozenset(fields)] = (
+                f"UPDATE {table} SET {set_clause}, updated_at = CURRENT_TIMESTAMP "
+                f"WHERE {key_column} = ?{_RETURNING}",
+                fields,
+            )
+    return statements
 
 def get_all_numbers() -> List[Dict]:
-    """Get all phone numbers."""
+    """
+    Get all phone numbers.
+    Each row also carries the linked prompt_name and keyword_set_name
+    (NULL if unlinked), joined here so callers don't look them up.
+    """
     with get_db() as conn:
-        rows = conn.execute("SELECT * FROM phone_numbers ORDER BY created_at DESC").fetchall()
+        rows = conn.execute("""
+            SELECT p.*,
+                   sp.name as prompt_name,
+                   kc.name as keyword_set_name
+            FROM phone_numbers p
+            LEFT JOIN system_prompts sp ON p.system_prompt_id = sp.id
+            LEFT JOIN keyword_corrections kc ON p.keyword_corrections_id = kc.id
+            ORDER BY p.created_at DESC
+        """).fetchall()
         return [dict(row) for row in rows]
 
 def get_number(phone: str) -> Optional[Dict]:
@@ -178,6 +320,11 @@ def get_number(phone: str) -> Optional[Dict]:
         ).fetchone()
         return dict(row) if row else None
 
+SQL_INSERT_NUMBER = """
+    INSERT INTO phone_numbers
+    (phone_number, business_name, business_type, greeting_name, system_prompt_id, keyword_corrections_id, is_demo, is_active)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""" + _RETURNING
+
 def add_number(
     phone_number: str,
     business_name: str,
@@ -190,18 +337,23 @@ def add_number(
 ) -> Dict:
     """Add a new phone number."""
     with get_db() as conn:
-        conn.execute("""
-            INSERT INTO phone_numbers
-            (phone_number, business_name, business_type, greeting_name, system_prompt_id, keyword_corrections_id, is_demo, is_active)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (phone_number, business_name, business_type, greeting_name, system_prompt_id, keyword_corrections_id, int(is_demo), int(is_active)))
+        row = _insert(conn, "phone_numbers", SQL_INSERT_NUMBER, (phone_number, business_name, business_type, greeting_name, system_prompt_id, keyword_corrections_id, int(is_demo), int(is_active)))
         conn.commit()
-    return get_number(phone_number)
+    invalidate_config(phone_number)
+    return dict(row)
+
+# Columns update_number() may set (hashed membership, built once)
+NUMBER_UPDATE_FIELDS = frozenset({
+    'business_name', 'business_type', 'greeting_name', 'system_prompt_id',
+    'keyword_corrections_id', 'is_demo', 'is_active',
+})
+_UPDATE_NUMBER_SQL = _update_statements(
+    "phone_numbers", "phone_number", tuple(sorted(NUMBER_UPDATE_FIELDS))
+)
 
 def update_number(phone_number: str, **kwargs) -> Optional[Dict]:
-    """Update a phone number config."""
-    allowed_fields = ['business_name', 'business_type', 'greeting_name', 'system_prompt_id', 'keyword_corrections_id', 'is_demo', 'is_active']
-    updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+    """Update a phone number config. Returns the updated row, or None if not found."""
+    updates = {k: v for k, v in kwargs.items() if k in NUMBER_UPDATE_FIELDS}
 
     if not updates:
         return get_number(phone_number)
@@ -212,17 +364,14 @@ def update_number(phone_number: str, **kwargs) -> Optional[Dict]:
     if 'is_demo' in updates:
         updates['is_demo'] = int(updates['is_demo'])
 
-    set_clause = ", ".join(f"{k} = ?" for k in updates.keys())
-    values = list(updates.values()) + [phone_number]
+    sql, fields = _UPDATE_NUMBER_SQL[frozenset(updates)]
+    values = [updates[k] for k in fields] + [phone_number]
 
     with get_db() as conn:
-        conn.execute(
-            f"UPDATE phone_numbers SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE phone_number = ?",
-            values
-        )
+        row = _update(conn, "phone_numbers", "phone_number", sql, values)
         conn.commit()
-
-    return get_number(phone_number)
+    invalidate_config(phone_number)
+    return dict(row) if row else None
 
 def delete_number(phone_number: str) -> bool:
     """Delete a phone number."""
@@ -232,34 +381,52 @@ def delete_number(phone_number: str) -> bool:
             (phone_number,)
         )
         conn.commit()
-        return cursor.rowcount > 0
+    invalidate_config(phone_number)
+    return cursor.rowcount > 0
+
+# Call-path lookup. sqlite3 caches prepared statements per connection keyed
+# by SQL text, so a fixed string is parsed and planned once per thread.
+SQL_GET_CONFIG_FOR_CALL = """
+    SELECT p.business_name, p.business_type, p.greeting_name,
+           p.is_demo,
+           COALESCE(sp.content, '') as system_prompt,
+           kc.corrections as keyword_corrections
+    FROM phone_numbers p
+    LEFT JOIN system_prompts sp ON p.system_prompt_id = sp.id
+    LEFT JOIN keyword_corrections kc ON p.keyword_corrections_id = kc.id
+    WHERE p.phone_number = ? AND p.is_active = 1
+"""
 
 def get_config_for_call(phone_number: str) -> Optional[Dict]:
     """
     Get config for an incoming call. Fast lookup.
     Returns None if number not found or inactive.
-    Joins with system_prompts and keyword_corrections.
+    Joins with system_prompts and keyword_corrections; the corrections are
+    also compiled into keyword_corrector for apply_corrections().
+    Served from _config_cache for up to CONFIG_CACHE_TTL seconds; the
+    returned dict is shared, so callers must not mutate it.
     """
+    cached = _config_cache.get(phone_number)
+    if cached is not None and time.monotonic() - cached[0] < CONFIG_CACHE_TTL:
+        return cached[1]
+    generation = _config_generation
+
     with get_db() as conn:
-        row = conn.execute("""
-            SELECT p.business_name, p.business_type, p.greeting_name,
-                   p.is_demo,
-                   COALESCE(sp.content, '') as system_prompt,
-                   kc.corrections as keyword_corrections
-            FROM phone_numbers p
-            LEFT JOIN system_prompts sp ON p.system_prompt_id = sp.id
-            LEFT JOIN keyword_corrections kc ON p.keyword_corrections_id = kc.id
-            WHERE p.phone_number = ? AND p.is_active = 1
-        """, (phone_number,)).fetchone()
+        row = conn.execute(SQL_GET_CONFIG_FOR_CALL, (phone_number,)).fetchone()
         if row:
             result = dict(row)
             # Parse keyword_corrections JSON if present
             if result.get('keyword_corrections'):
-                result['keyword_corrections'] = json.loads(result['keyword_corrections'])
+                result['keyword_corrections'] = orjson.loads(result['keyword_corrections'])
             else:
                 result['keyword_corrections'] = {}
-            return result
-        return None
+            result['keyword_corrector'] = KeywordCorrector(result['keyword_corrections'])
+        else:
+            result = None
+    with _config_lock:
+        if generation == _config_generation:
+            _config_cache[phone_number] = (time.monotonic(), result)
+    return result
 
 
 # ============ System Prompts CRUD ============
@@ -279,17 +446,19 @@ def get_prompt(prompt_id: int) -> Optional[Dict]:
         ).fetchone()
         return dict(row) if row else None
 
+SQL_INSERT_PROMPT = "INSERT INTO system_prompts (name, content) VALUES (?, ?)" + _RETURNING
+
 def add_prompt(name: str, content: str) -> Dict:
     """Add a new system prompt."""
     with get_db() as conn:
-        cursor = conn.execute("""
-            INSERT INTO system_prompts (name, content) VALUES (?, ?)
-        """, (name, content))
+        row = _insert(conn, "system_prompts", SQL_INSERT_PROMPT, (name, content))
         conn.commit()
-        return get_prompt(cursor.lastrowid)
+        return dict(row)
+
+_UPDATE_PROMPT_SQL = _update_statements("system_prompts", "id", ("name", "content"))
 
 def update_prompt(prompt_id: int, name: str = None, content: str = None) -> Optional[Dict]:
-    """Update a system prompt."""
+    """Update a system prompt. Returns the updated row, or None if not found."""
     updates = {}
     if name is not None:
         updates['name'] = name
@@ -299,17 +468,14 @@ def update_prompt(prompt_id: int, name: str = None, content: str = None) -> Opti
     if not updates:
         return get_prompt(prompt_id)
 
-    set_clause = ", ".join(f"{k} = ?" for k in updates.keys())
-    values = list(updates.values()) + [prompt_id]
+    sql, fields = _UPDATE_PROMPT_SQL[frozenset(updates)]
+    values = [updates[k] for k in fields] + [prompt_id]
 
     with get_db() as conn:
-        conn.execute(
-            f"UPDATE system_prompts SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-            values
-        )
+        row = _update(conn, "system_prompts", "id", sql, values)
         conn.commit()
-
-    return get_prompt(prompt_id)
+        invalidate_config()  # cached configs embed this row's content
+        return dict(row) if row else None
 
 def delete_prompt(prompt_id: int) -> bool:
     """Delete a system prompt. Sets phone numbers using it to NULL."""
@@ -325,6 +491,7 @@ def delete_prompt(prompt_id: int) -> bool:
             (prompt_id,)
         )
         conn.commit()
+        invalidate_config()
         return cursor.rowcount > 0
 
 
@@ -337,7 +504,7 @@ def get_all_keywords() -> List[Dict]:
         result = []
         for row in rows:
             d = dict(row)
-            d['corrections'] = json.loads(d['corrections'])
+            d['corrections'] = orjson.loads(d['corrections'])
             result.append(d)
         return result
 
@@ -350,41 +517,49 @@ def get_keywords(keyword_id: int) -> Optional[Dict]:
         ).fetchone()
         if row:
             d = dict(row)
-            d['corrections'] = json.loads(d['corrections'])
+            d['corrections'] = orjson.loads(d['corrections'])
             return d
         return None
 
+SQL_INSERT_KEYWORDS = "INSERT INTO keyword_corrections (name, corrections) VALUES (?, ?)" + _RETURNING
+
 def add_keywords(name: str, corrections: Dict) -> Dict:
     """Add a new keyword correction set."""
     with get_db() as conn:
-        cursor = conn.execute("""
-            INSERT INTO keyword_corrections (name, corrections) VALUES (?, ?)
-        """, (name, json.dumps(corrections)))
+        row = _insert(
+            conn, "keyword_corrections", SQL_INSERT_KEYWORDS,
+            (name, orjson.dumps(corrections).decode()),
+        )
         conn.commit()
-        return get_keywords(cursor.lastrowid)
+        d = dict(row)
+        d['corrections'] = orjson.loads(d['corrections'])
+        return d
+
+_UPDATE_KEYWORDS_SQL = _update_statements("keyword_corrections", "id", ("name", "corrections"))
 
 def update_keywords(keyword_id: int, name: str = None, corrections: Dict = None) -> Optional[Dict]:
-    """Update a keyword correction set."""
+    """Update a keyword correction set. Returns the updated row, or None if not found."""
     updates = {}
     if name is not None:
         updates['name'] = name
     if corrections is not None:
-        updates['corrections'] = json.dumps(corrections)
+        updates['corrections'] = orjson.dumps(corrections).decode()
 
     if not updates:
         return get_keywords(keyword_id)
 
-    set_clause = ", ".join(f"{k} = ?" for k in updates.keys())
-    values = list(updates.values()) + [keyword_id]
+    sql, fields = _UPDATE_KEYWORDS_SQL[frozenset(updates)]
+    values = [updates[k] for k in fields] + [keyword_id]
 
     with get_db() as conn:
-        conn.execute(
-            f"UPDATE keyword_corrections SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-            values
-        )
+        row = _update(conn, "keyword_corrections", "id", sql, values)
         conn.commit()
-
-    return get_keywords(keyword_id)
+        invalidate_config()  # cached configs embed this row's content
+        if row:
+            d = dict(row)
+            d['corrections'] = orjson.loads(d['corrections'])
+            return d
+        return None
 
 def delete_keywords(keyword_id: int) -> bool:
     """Delete a keyword correction set. Sets phone numbers using it to NULL."""
@@ -400,4 +575,5 @@ def delete_keywords(keyword_id: int) -> bool:
             (keyword_id,)
         )
         conn.commit()
+        invalidate_config()
         return cursor.rowcount > 0
@@ -0,0 +1,193 @@
+"""
+GPU helpers shared by the model loaders and the warmup script.
+
+torch is imported lazily so these helpers can be used from code paths that
+run before the CUDA runtime is initialized.
+"""
+import itertools
+import logging
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def side_stream():
+    """
+    Run the enclosed CUDA work on a fresh stream, then join it back.
+
+    Lets independent loads/forwards from different threads overlap on the GPU.
+    The caller's current stream waits on the side stream on exit, so work
+    queued afterwards sees the results. No-op without CUDA.
+    """
+    import torch
+
+    if not torch.cuda.is_available():
+        yield None
+        return
+
+    stream = torch.cuda.Stream()
+    caller_stream = torch.cuda.current_stream()
+    with torch.cuda.stream(stream):
+        yield stream
+    caller_stream.wait_stream(stream)
+
+
+def _parse_cpulist(cpulist: str) -> set:
+    """Parse a sysfs cpulist such as "0-15,32-47" into a set of CPU ids."""
+    cpus = set()
+    for part in cpulist.strip().split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.update(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def cpus_near_gpu(device: str = None) -> set:
+    """
+    Return the CPUs on the NUMA node attached to a GPU's PCIe root complex.
+
+    Resolves the GPU's PCI address with nvidia-smi (so CUDA is not
+    initialized) and reads its local_cpulist from sysfs. Returns an empty set
+    when the topology can't be determined.
+    """
+    if device is None:
+        device = os.environ.get("CUDA_VISIBLE_DEVICES", "0").split(",")[0] or "0"
+
+    try:
+        bus_id = subprocess.run(
+            ["nvidia-smi", "--query-gpu=pci.bus_id", "--format=csv,noheader", "-i", device],
+            capture_output=True, text=True, check=True, timeout=10,
+        ).stdout.strip()
+        # nvidia-smi reports an 8-digit domain ("00000000:3B:00.0"); sysfs uses 4
+        domain, _, rest = bus_id.partition(":")
+        sysfs_path = f"/sys/bus/pci/devices/{domain[-4:]}:{rest}".lower() + "/local_cpulist"
+        with open(sysfs_path) as f:
+            return _parse_cpulist(f.read())
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        logger.warning(f"Could not resolve GPU NUMA node: {e}")
+        return set()
+
+
+def pin_to_gpu_numa_node(device: str = None):
+    """
+    Restrict this process to the CPUs local to the GPU.
+
+    Call before importing torch: threads (and the pinned-memory allocations
+    they first-touch) inherit the affinity, keeping H2D DMA off the socket
+    interconnect on multi-socket hosts. No-op if the node can't be found or
+    doesn't overlap the CPUs we're allowed to run on.
+    """
+    cpus = cpus_near_gpu(device) & os.sched_getaffinity(0)
+    if not cpus:
+        return
+    os.sched_setaffinity(0, cpus)
+    logger.info(f"Pinned to {len(cpus)} CPUs local to the GPU")
+
+
+def configure_compile_cache(cache_dir: str):
+    """
+    Persist compile/autotune artifacts across container restarts.
+
+    Points the TorchInductor and Triton caches at cache_dir (a RunPod volume
+    by default) so later boots reuse generated kernels instead of re-running
+    codegen and autotune, and enables cuDNN autotuning for the conv stacks in
+    Parakeet and Kokoro. Call before the first compile/forward. Existing
+    environment overrides win.
+    """
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.join(cache_dir, "inductor"))
+    os.environ.setdefault("TRITON_CACHE_DIR", os.path.join(cache_dir, "triton"))
+    for path in (os.environ["TORCHINDUCTOR_CACHE_DIR"], os.environ["TRITON_CACHE_DIR"]):
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Compile cache dir {path} unavailable: {e}")
+
+    import torch
+
+    torch.backends.cudnn.benchmark = True
+
+
+def enable_tf32():
+    """Allow TF32 for fp32 matmuls/convs so autotune picks the tensor-core paths."""
+    import torch
+
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+
+
+@contextmanager
+def cuda_timer():
+    """
+    Time the enclosed work on the current stream with CUDA events.
+
+    Yields a callable returning elapsed GPU milliseconds. Calling it blocks on
+    the end event only, so read it after the stream has been synchronized to
+    avoid stalling other queued work. Falls back to wall clock without CUDA.
+    """
+    import torch
+
+    if not torch.cuda.is_available():
+        start = time.perf_counter()
+        elapsed = []
+        yield lambda: elapsed[0]
+        elapsed.append((time.perf_counter() - start) * 1000)
+        return
+
+    start_event = torch.cuda.Event(enable_timing=True)
+    end_event = torch.cuda.Event(enable_timing=True)
+
+    def elapsed_ms():
+        end_event.synchronize()
+        return start_event.elapsed_time(end_event)
+
+    start_event.record()
+    yield elapsed_ms
+    end_event.record()
+
+
+def free_memory_fraction() -> float:
+    """Fraction of device memory currently free (1.0 without CUDA)."""
+    import torch
+
+    if not torch.cuda.is_available():
+        return 1.0
+    free, total = torch.cuda.mem_get_info()
+    return free / total
+
+
+def synchronize():
+    """Block until all queued CUDA work has finished (no-op without CUDA)."""
+    import torch
+
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+
+
+def to_device_pinned(module, device: str = "cuda"):
+    """
+    Move a module's weights to the GPU through pinned host staging.
+
+    Each CPU tensor is copied into page-locked memory and sent with a
+    non_blocking copy on a dedicated stream, so transfers run as DMA at full
+    PCIe bandwidth and overlap with staging the next tensor. The caller's
+    stream waits on the copy stream before returning.
+    """
+    import torch
+
+    if not torch.cuda.is_available():
+        return module.to(device)
+
+    copy_stream = torch.cuda.Stream()
+    with torch.no_grad(), torch.cuda.stream(copy_stream):
+        for tensor in itertools.chain(module.parameters(), module.buffers()):
+            if tensor.device.type == "cuda":
+                continue
+            tensor.data = tensor.data.pin_memory().to(device, non_blocking=True)
+    torch.cuda.current_stream().wait_stream(copy_stream)
+
+    return module
@@ -5,13 +5,19 @@ Switched from vLLM to Transformers for stability. vLLM 0.13.0's v1 engine
 spawns child processes that fail CUDA init on RunPod. For a 0.5B model,
 Transformers is plenty fast (~50-80ms) and runs single-process.
 """
+import asyncio
+import copy
 import logging
+import threading
 import time
+from functools import lru_cache
 from typing import List, Dict, Optional
 from pathlib import Path
 
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, BatchEncoding
+
+from . import gpu_utils
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +25,22 @@ logger = logging.getLogger(__name__)
 _model = None
 _tokenizer = None
 
+# Prompt lengths are left-padded up to one of these when the forward is
+# compiled, so each bucket is one captured graph instead of a recompile
+# per distinct prompt length. Prompts longer than the last bucket run as-is.
+PREFILL_BUCKETS = (32, 64, 128, 256, 512)
+_compiled = False
+
+# Serializes model.generate between the batcher's worker thread and any
+# direct caller (startup warmup). Never take it on the event loop thread:
+# async code goes through batcher.generate()
+_generate_lock = threading.Lock()
+
+# Per-call KV cache from the previous turn: session_id -> (token ids the
+# cache covers, cache). Each turn's prompt is the previous prompt plus reply
+# plus the new user message, so only that tail needs a prefill.
+_sessions = {}
+
 # Load conversation prompt template
 PROMPT_TEMPLATE = None
 
@@ -56,26 +78,78 @@ Keep responses brief (1-3 sentences). This is a phone conversation."""
     return PROMPT_TEMPLATE
 
 
-def load_model(model_name: str = "Qwen/Qwen2.5-0.5B-Instruct"):
-    """Load Qwen LLM with HuggingFace Transformers."""
-    global _model, _tokenizer
+def load_model(
+    model_name: str = "Qwen/Qwen2.5-0.5B-Instruct",
+    quant: str = "",
+    compile: bool = False,
+):
+    """
+    Load Qwen LLM with HuggingFace Transformers.
+
+    Args:
+        model_name: HF model id
+        quant: "" for fp16, "int8" (bitsandbytes), "int4" (torchao, group-128
+            weight-only, bf16 activations) or "fp8" (torchao, Ada/Hopper)
+        compile: torch.compile the forward in reduce-overhead (CUDA graph) mode
+    """
+    global _model, _tokenizer, _compiled
 
     if _model is not None:
         return _model
 
-    logger.info(f"Loading LLM: {model_name}")
+    if quant not in ("", "int8", "int4", "fp8"):
+        raise ValueError(f"Unsupported LLM quantization: {quant!r}")
 
-    # Load tokenizer
-    _tokenizer = AutoTokenizer.from_pretrained(model_name)
+    logger.info(f"Loading LLM: {model_name} ({quant or 'fp16'})")
 
-    # Load model in FP16 for speed
-    _model = AutoModelForCausalLM.from_pretrained(
-        model_name,
-        torch_dtype=torch.float16,
-        device_map="cuda",
-    )
+    # Load tokenizer (left padding so batched prompts end at the generation point)
+    _tokenizer = AutoTokenizer.from_pretrained(model_name, padding_side="left")
+
+    if quant == "int8":
+        # bitsandbytes quantizes while placing weights, so it owns the device move
+        from transformers import BitsAndBytesConfig
+
+        _model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            torch_dtype=torch.float16,
+            quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+            device_map="cuda",
+        )
+    else:
+        # Load model in FP16 for speed (built on CPU, then staged to GPU via pinned memory).
+        # torchao's int4 kernel (tinygemm) takes bf16 activations instead.
+        _model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            torch_dtype=torch.bfloat16 if quant == "int4" else torch.float16,
+        )
+        gpu_utils.to_device_pinned(_model)
+
+        if quant == "fp8":
+            from torchao.quantization import quantize_, float8_weight_only
+
+            quantize_(_model, float8_weight_only())
+        elif quant == "int4":
+            from torchao.quantization import quantize_, int4_weight_only
+
+            quantize_(_model, int4_weight_only(group_size=128))
     _model.eval()
 
+    if compile:
+        # Static KV cache keeps decode shapes fixed so the compiled graph is
+        # replayed instead of recompiled every step. Each prefill bucket and
+        # decode shape is its own graph, hence the larger cache limit.
+        # Compilation and graph recording happen on the first forward of each
+        # shape. A decode shape includes the static cache length (prompt
+        # bucket + max_new_tokens), so the startup warmups do not pre-record
+        # every graph live turns use; those are recorded on first use.
+        logger.info("Compiling LLM forward (reduce-overhead)...")
+        torch._dynamo.config.cache_size_limit = 64
+        _model.generation_config.cache_implementation = "static"
+        _model.forward = torch.compile(
+            _model.forward, mode="reduce-overhead", fullgraph=False, dynamic=False
+        )
+        _compiled = True
+
     # Warmup inference
     logger.info("Warming up LLM...")
     warmup_messages = [{"role": "user", "content": "Hello"}]
@@ -85,6 +159,243 @@ def load_model(model_name: str = "Qwen/Qwen2.5-0.5B-Instruct"):
     return _model
 
 
+def warmup_tokenizer():
+    """
+    Exercise the tokenizer and chat template with representative inputs.
+
+    The first encode initializes the Rust tokenizer's normalizer and
+    pre-tokenizer state and the first apply_chat_template compiles the Jinja
+    template; doing both here keeps that off the first live turn.
+    """
+    if _model is None:
+        load_model()
+
+    samples = (
+        "Hi.",
+        "My water heater is leaking, can someone come out today?",
+        "It's 123 Main St., unit #4B - call me back at (555) 010-2345!",
+        "Yeah so um the toilet upstairs keeps running and running and I've tried "
+        "jiggling the handle like three times but it just won't stop, it's been going all night.",
+    )
+
+    start = time.perf_counter()
+    for text in samples:
+        _tokenizer.encode(text, return_tensors="pt")
+        _build_prompt(
+            [{"role": "user", "content": text}],
+            "the plumbing company",
+            "the owner",
+            "Benny",
+            None,
+        )
+    elapsed = (time.perf_counter() - start) * 1000
+    logger.info(f"  Tokenizer warmup: {elapsed:.1f}ms")
+
+
+def warmup_prefill(lens=PREFILL_BUCKETS, num_runs: int = 2):
+    """
+    Warm the prefill forward for each bucketed prompt length.
+
+    Real prompts (system prompt + growing history) span a few hundred tokens;
+    running one forward per bucket picks cuBLAS/SDPA kernels for each shape
+    here instead of spiking time-to-first-token on live calls.
+    """
+    if _model is None:
+        load_model()
+
+    for prompt_len in lens:
+        input_ids = torch.randint(
+            0, _tokenizer.vocab_size, (1, prompt_len), device=_model.device
+        )
+        timings = []
+        for _ in range(num_runs):
+            start = time.perf_counter()
+            with torch.inference_mode():
+                _model(input_ids=input_ids, use_cache=False)
+            torch.cuda.current_stream().synchronize()
+            timings.append((time.perf_counter() - start) * 1000)
+        logger.info(
+            f"  Prefill warmup len={prompt_len}: "
+            + ", ".join(f"{t:.1f}ms" for t in timings)
+        )
+
+
+def warmup_decode(
+    batch_sizes=(1, 2, 4, 8),
+    prompt_len: int = 32,
+    decode_len: int = 32,
+    num_runs: int = 2,
+):
+    """
+    Warm the decode loop for each expected batch size.
+
+    Runs fixed-shape greedy generation (prompt_len prompt tokens, exactly
+    decode_len new tokens) so cuBLAS handles, KV-cache allocations and
+    attention kernels for every batch shape are set up before live traffic
+    instead of on the first request that hits them.
+
+    This captures no CUDA graphs of its own: generate() runs the decode
+    loop in Python, step by step. With compile=True the compiled forward
+    records graphs for these shapes only (see load_model()).
+    """
+    if _model is None:
+        load_model()
+
+    pad_token_id = _tokenizer.pad_token_id or _tokenizer.eos_token_id
+
+    for batch_size in batch_sizes:
+        input_ids = torch.randint(
+            0, _tokenizer.vocab_size, (batch_size, prompt_len), device=_model.device
+        )
+        attention_mask = torch.ones_like(input_ids)
+
+        for run in range(num_runs):
+            start = time.perf_counter()
+            with torch.no_grad():
+                _model.generate(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    max_new_tokens=decode_len,
+                    min_new_tokens=decode_len,
+                    do_sample=False,
+                    pad_token_id=pad_token_id,
+                )
+            elapsed = (time.perf_counter() - start) * 1000
+            logger.info(f"  Decode warmup bs={batch_size} run {run+1}/{num_runs}: {elapsed:.1f}ms")
+
+
+@lru_cache(maxsize=256)
+def _system_prompt(
+    system_prompt: Optional[str],
+    business_name: str,
+    owner_name: str,
+    greeting_name: str,
+) -> str:
+    """Fill the business placeholders into the custom prompt or the template."""
+    # Use custom system prompt if provided, otherwise use template
+    template = system_prompt or load_prompt_template()
+    return template.format(
+        business_name=business_name,
+        owner_name=owner_name,
+        greeting_name=greeting_name,
+    )
+
+
+@lru_cache(maxsize=256)
+def _system_prefix(system: str):
+    """
+    Templated system turn and its token ids.
+
+    Every prompt for a business starts with this segment, so it is
+    templated and tokenized once instead of on every turn.
+    """
+    text = _tokenizer.apply_chat_template(
+        [{"role": "system", "content": system}],
+        tokenize=False,
+    )
+    ids = _tokenizer(text, add_special_tokens=False, return_tensors="pt")["input_ids"][0]
+    return text, ids
+
+
+def _build_prompt(
+    messages: List[Dict[str, str]],
+    business_name: str,
+    owner_name: str,
+    greeting_name: str,
+    system_prompt: Optional[str],
+) -> str:
+    """Format the system prompt and apply the Qwen chat template."""
+    system = _system_prompt(system_prompt, business_name, owner_name, greeting_name)
+
+    # Format messages for Qwen
+    formatted_messages = [{"role": "system", "content": system}]
+    formatted_messages.extend(messages)
+
+    # Apply chat template
+    return _tokenizer.apply_chat_template(
+        formatted_messages,
+        tokenize=False,
+        add_generation_prompt=True,
+    )
+
+
+@lru_cache(maxsize=8)
+def _generation_config(max_tokens: int, temperature: float):
+    """
+    Sampling GenerationConfig for one (max_tokens, temperature) pair.
+
+    Built once per pair on top of the model's own config (which carries the
+    static cache setting when compiled) instead of generate() validating
+    and merging the same kwargs on every turn.
+    """
+    config = copy.deepcopy(_model.generation_config)
+    config.update(
+        max_new_tokens=max_tokens,
+        temperature=temperature,
+        top_p=0.9,
+        do_sample=True,
+        num_beams=1,
+        pad_token_id=_tokenizer.pad_token_id or _tokenizer.eos_token_id,
+    )
+    return config
+
+
+def _encode(prompt: str, system: str) -> "torch.Tensor":
+    """
+    Token ids for one templated prompt, reusing the cached system turn.
+
+    Only the text after the system turn is tokenized. The split falls right
+    before an <|im_start|> special token, which the tokenizer never merges
+    across, so the ids match tokenizing the whole prompt.
+    """
+    prefix, prefix_ids = _system_prefix(system)
+    if not prompt.startswith(prefix):
+        return _tokenizer(prompt, return_tensors="pt")["input_ids"][0]
+
+    tail_ids = _tokenizer(
+        prompt[len(prefix):], add_special_tokens=False, return_tensors="pt"
+    )["input_ids"][0]
+    return torch.cat((prefix_ids, tail_ids))
+
+
+def _tokenize(prompts, input_ids: Optional["torch.Tensor"] = None):
+    """
+    Tokenize (left-padded), bucketing the length when the forward is compiled.
+
+    input_ids: Already-encoded ids for a single prompt (see _encode()), used
+        instead of tokenizing prompts.
+    """
+    if input_ids is not None:
+        inputs = BatchEncoding({
+            "input_ids": input_ids[None],
+            "attention_mask": torch.ones_like(input_ids)[None],
+        })
+    else:
+        inputs = _tokenizer(prompts, return_tensors="pt", padding=True)
+
+    if _compiled:
+        length = inputs["input_ids"].shape[1]
+        bucket = next((b for b in PREFILL_BUCKETS if b >= length), length)
+        if bucket != length:
+            inputs = _tokenizer.pad(
+                inputs, padding="max_length", max_length=bucket, return_tensors="pt"
+            )
+
+    return inputs.to(_model.device)
+
+
+def _shared_prefix_len(a: "torch.Tensor", b: "torch.Tensor") -> int:
+    """Length of the common leading run of two 1-D token id tensors."""
+    n = min(len(a), len(b))
+    mismatch = (a[:n] != b[:n]).nonzero()
+    return int(mismatch[0]) if len(mismatch) else n
+
+
+def end_session(session_id: str):
+    """Drop a call's cached KV (call ended)."""
+    _sessions.pop(session_id, None)
+
+
 def generate(
     messages: List[Dict[str, str]],
     business_name: str = "the plumbing company",
@@ -93,6 +404,7 @@ def generate(
     system_prompt: Optional[str] = None,
     max_tokens: int = 256,
     temperature: float = 0.7,
+    session_id: Optional[str] = None,
 ) -> str:
     """
     Generate a response from the LLM.
@@ -105,6 +417,9 @@ def generate(
         system_prompt: Custom system prompt (overrides template if provided)
         max_tokens: Maximum tokens to generate
         temperature: Sampling temperature
+        session_id: Call id; reuses the KV cache of this call's previous turn
+            for the shared prompt prefix (end with end_session()). Ignored
+            when the forward is compiled (its static cache is per-shape).
 
     Returns:
         Generated response text
@@ -114,60 +429,200 @@ def generate(
     if _model is None:
         load_model()
 
-    # Use custom system prompt if provided, otherwise use template
-    if system_prompt:
-        # Format any placeholders in the custom prompt
-        system_prompt = system_prompt.format(
-            business_name=business_name,
-            owner_name=owner_name,
-            greeting_name=greeting_name,
-        )
-    else:
-        template = load_prompt_template()
-        system_prompt = template.format(
-            business_name=business_name,
-            owner_name=owner_name,
-            greeting_name=greeting_name,
-        )
-
-    # Format messages for Qwen
-    formatted_messages = [{"role": "system", "content": system_prompt}]
-    formatted_messages.extend(messages)
-
-    # Apply chat template
-    prompt = _tokenizer.apply_chat_template(
-        formatted_messages,
-        tokenize=False,
-        add_generation_prompt=True,
-    )
-
-    # Tokenize
-    inputs = _tokenizer(prompt, return_tensors="pt").to(_model.device)
+    prompt = _build_prompt(messages, business_name, owner_name, greeting_name, system_prompt)
+
+    # Tokenize (system turn ids come from cache)
+    system = _system_prompt(system_prompt, business_name, owner_name, greeting_name)
+    inputs = _tokenize(prompt, input_ids=_encode(prompt, system))
+    input_ids = inputs["input_ids"][0]
+
+    # Reuse the previous turn's KV for the prefix this prompt shares with it
+    # (cropped at the first differing token, keeping at least one to prefill)
+    use_session = session_id is not None and not _compiled
+    past_key_values = None
+    reused = 0
+    if use_session and session_id in _sessions:
+        cached_ids, cache = _sessions.pop(session_id)
+        reused = min(_shared_prefix_len(cached_ids, input_ids), len(input_ids) - 1)
+        if reused > 0:
+            cache.crop(reused)
+            past_key_values = cache
 
     # Generate
     start = time.perf_counter()
-    with torch.no_grad():
+    with _generate_lock, torch.no_grad():
         outputs = _model.generate(
             **inputs,
-            max_new_tokens=max_tokens,
-            temperature=temperature,
-            top_p=0.9,
-            do_sample=True,
-            pad_token_id=_tokenizer.pad_token_id or _tokenizer.eos_token_id,
+            past_key_values=past_key_values,
+            generation_config=_generation_config(max_tokens, temperature),
+            return_dict_in_generate=True,
         )
     elapsed = (time.perf_counter() - start) * 1000
+    sequence = outputs.sequences[0]
+
+    if use_session:
+        cache = outputs.past_key_values
+        _sessions[session_id] = (sequence[:cache.get_seq_length()], cache)
 
     # Decode only the new tokens
     response = _tokenizer.decode(
-        outputs[0][inputs["input_ids"].shape[1]:],
+        sequence[len(input_ids):],
         skip_special_tokens=True,
     ).strip()
 
-    logger.debug(f"LLM completed in {elapsed:.1f}ms: {response[:50]}...")
+    logger.debug(
+        f"LLM completed in {elapsed:.1f}ms ({reused}/{len(input_ids)} prompt tokens cached): "
+        f"{response[:50]}..."
+    )
 
     return response
 
 
+def generate_batch(
+    conversations: List[List[Dict[str, str]]],
+    business_name: str = "the plumbing company",
+    owner_name: str = "the owner",
+    greeting_name: str = "Benny",
+    system_prompt: Optional[str] = None,
+    max_tokens: int = 256,
+    temperature: float = 0.7,
+) -> List[str]:
+    """
+    Generate responses for several conversations in one padded batch.
+
+    Args:
+        conversations: One message history per request (see generate())
+        Remaining args as for generate(), shared by every conversation
+
+    Returns:
+        Generated response text per conversation, in order
+    """
+    if _model is None:
+        load_model()
+
+    prompts = [
+        _build_prompt(messages, business_name, owner_name, greeting_name, system_prompt)
+        for messages in conversations
+    ]
+    return _generate_prompts(prompts, max_tokens, temperature)
+
+
+def _generate_prompts(prompts: List[str], max_tokens: int, temperature: float) -> List[str]:
+    """Run already-templated prompts as one left-padded batch."""
+    inputs = _tokenize(prompts)
+
+    start = time.perf_counter()
+    with _generate_lock, torch.no_grad():
+        outputs = _model.generate(
+            **inputs,
+            generation_config=_generation_config(max_tokens, temperature),
+        )
+    elapsed = (time.perf_counter() - start) * 1000
+
+    # Left padding: new tokens start at the same offset for every row
+    prompt_len = inputs["input_ids"].shape[1]
+    responses = [
+        text.strip()
+        for text in _tokenizer.batch_decode(outputs[:, prompt_len:], skip_special_tokens=True)
+    ]
+
+    logger.debug(f"LLM batch of {len(prompts)} completed in {elapsed:.1f}ms")
+
+    return responses
+
+
+def _prompt_for(
+    messages: List[Dict[str, str]],
+    business_name: str = "the plumbing company",
+    owner_name: str = "the owner",
+    greeting_name: str = "Benny",
+    system_prompt: Optional[str] = None,
+    **_,
+) -> str:
+    """_build_prompt() from generate()-style kwargs (same defaults)."""
+    return _build_prompt(messages, business_name, owner_name, greeting_name, system_prompt)
+
+
+class GenerateBatcher:
+    """
+    Coalesce concurrent generate() calls into batched forwards.
+
+    Requests already queued when the worker picks up work (up to
+    max_batch_size; typically those that arrived while the previous batch
+    was generating) run as one left-padded generate, grouped by sampling
+    settings, on a worker thread so the event loop keeps serving audio.
+    A request that ends up alone goes through generate() unchanged, so it
+    keeps its call's KV session reuse.
+
+    window_ms > 0 additionally waits that long for stragglers, but only
+    when another request is already queued; a lone request never waits.
+    """
+
+    def __init__(self, max_batch_size: int = 8, window_ms: float = 0.0):
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def generate(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Queue one request (generate() arguments) and wait for its reply."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((messages, kwargs, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            if self.window and not self._queue.empty():
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                responses = await asyncio.to_thread(self._generate, batch)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, _, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    @staticmethod
+    def _generate(batch) -> List[str]:
+        if _model is None:
+            load_model()
+
+        if len(batch) == 1:
+            messages, kwargs, _ = batch[0]
+            return [generate(messages, **kwargs)]
+
+        # One padded generate per distinct (max_tokens, temperature)
+        groups = {}
+        for i, (_, kwargs, _) in enumerate(batch):
+            key = (kwargs.get("max_tokens", 256), kwargs.get("temperature", 0.7))
+            groups.setdefault(key, []).append(i)
+
+        responses = [None] * len(batch)
+        for (max_tokens, temperature), indices in groups.items():
+            prompts = [_prompt_for(batch[i][0], **batch[i][1]) for i in indices]
+            for i, response in zip(indices, _generate_prompts(prompts, max_tokens, temperature)):
+                responses[i] = response
+
+        logger.debug(f"LLM batcher ran {len(batch)} requests in {len(groups)} batch(es)")
+        return responses
+
+
+# Shared batcher for every async caller (twilio_ws, the /llm and /pipeline endpoints)
+batcher = GenerateBatcher()
+
+
 def generate_simple(user_input: str, **kwargs) -> str:
     """
     Simple single-turn generation.
@@ -9,11 +9,11 @@ from typing import List, Dict, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Query, WebSocket
-from fastapi.responses import Response, JSONResponse
+from fastapi.responses import Response, JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 
 from .config import settings
-from . import llm, tts, database as db
+from . import audio_utils, gpu_utils, llm, tts, database as db
 from .admin import router as admin_router
 from .stt_corrections import apply_corrections
 from .twilio_handlers import router as twilio_router
@@ -39,6 +39,11 @@ async def lifespan(app: FastAPI):
     """Load models on startup."""
     logger.info("Starting BuddyHelps Voice Server...")
 
+    # Reuse kernels compiled/autotuned by the warmup script
+    gpu_utils.configure_compile_cache(settings.compile_cache_dir)
+    gpu_utils.enable_tf32()
+    logger.info(f"Audio kernels: {audio_utils.kernel_info()}")
+
     # Initialize database
     logger.info("Initializing database...")
     db.init_db()
@@ -58,7 +63,9 @@ async def lifespan(app: FastAPI):
     stt.warmup()
 
     logger.info("Loading LLM model...")
-    llm.load_model(settings.llm_model)
+    llm.load_model(
+        settings.llm_model, quant=settings.llm_quant, compile=settings.llm_compile
+    )
 
     logger.info("Loading TTS model...")
     tts.load_model()
@@ -67,6 +74,7 @@ async def lifespan(app: FastAPI):
     yield
 
     logger.info("Shutting down...")
+    db.close_all()
 
 
 app = FastAPI(
@@ -74,6 +82,8 @@ app = FastAPI(
     description="Self-hosted voice AI inference for BuddyHelps",
     version="1.0.0",
     lifespan=lifespan,
+    # orjson for every JSON route, not just the admin router
+    default_response_class=ORJSONResponse,
 )
 
 # Include routers
@@ -182,7 +192,7 @@ async def generate_response(request: LLMRequest):
     start = time.perf_counter()
 
     try:
-        text = llm.generate(
+        text = await llm.batcher.generate(
             messages=request.messages,
             business_name=request.business_name,
             owner_name=request.owner_name,
@@ -271,7 +281,7 @@ async def full_pipeline(
         if phone_number:
             config = db.get_config_for_call(phone_number)
             if config:
-                keyword_corrections = config.get('keyword_corrections', {})
+                keyword_corrections = config['keyword_corrector']
                 system_prompt = config.get('system_prompt') or None
                 greeting_name = config.get('greeting_name', greeting_name)
                 # Use config values if not overridden
@@ -293,7 +303,7 @@ async def full_pipeline(
 
         # LLM
         llm_start = time.perf_counter()
-        response_text = llm.generate(
+        response_text = await llm.batcher.generate(
             messages=history,
             business_name=business_name,
             owner_name=owner_name,
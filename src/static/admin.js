@@ -0,0 +1,631 @@
+const NUMBERS_API = '/api/numbers';
+const PROMPTS_API = '/api/prompts';
+const KEYWORDS_API = '/api/keywords';
+const TWILIO_API = '/api/twilio';
+const BOOTSTRAP_API = '/api/admin/bootstrap';
+let numbersCache = [];
+let promptsCache = [];
+let keywordsCache = [];
+let unconfiguredTwilioSids = [];
+
+// ============ Tab Navigation ============
+function showTab(tab) {
+    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    document.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));
+    document.querySelector(`.tab[onclick="showTab('${tab}')"]`).classList.add('active');
+    document.getElementById(`${tab}-tab`).classList.add('active');
+}
+
+// ============ Initial load ============
+// One round-trip for all three tables. Edits then patch the local caches
+// from each write's response instead of reloading a table.
+async function loadAll() {
+    await cachedFetch(BOOTSTRAP_API, ({ numbers, prompts, keywords }) => {
+        renderPrompts(prompts);
+        renderKeywords(keywords);
+        renderNumbers(numbers);
+    });
+}
+
+// ============ Numbers ============
+function renderNumbers(numbers) {
+    numbersCache = numbers;
+    const tbody = document.getElementById('numbers-table');
+    if (numbers.length === 0) {
+        messageRow(tbody, 9, 'No phone numbers configured. Add one to get started.');
+        return;
+    }
+
+    // prompt_name / keyword_set_name are joined server-side
+    renderRows(tbody, numbers, n => el('tr', {},
+        el('td', {}, el('strong', {}, n.phone_number)),
+        el('td', {}, n.business_name),
+        el('td', {}, el('span', { class: 'badge badge-type' }, n.business_type)),
+        el('td', {}, n.greeting_name),
+        el('td', {}, n.prompt_name || el('em', { style: 'color:#999' }, 'Default')),
+        el('td', {}, n.keyword_set_name || el('em', { style: 'color:#999' }, 'None')),
+        el('td', {}, el('span', { class: `badge ${n.is_demo ? 'badge-inactive' : 'badge-type'}` }, n.is_demo ? 'Demo' : 'Live')),
+        el('td', {}, el('span', { class: `badge ${n.is_active ? 'badge-active' : 'badge-inactive'}` }, n.is_active ? 'Active' : 'Inactive')),
+        el('td', { class: 'actions' },
+            el('button', { class: 'btn-primary', onclick: () => editNumber(n.phone_number) }, 'Edit'),
+            el('button', { class: 'btn-danger', onclick: () => deleteNumber(n.phone_number) }, 'Delete'))
+    ));
+}
+
+function showAddNumberModal() {
+    document.getElementById('number-modal-title').textContent = 'Add Number';
+    document.getElementById('number-form').reset();
+    document.getElementById('edit-phone').value = '';
+    document.getElementById('phone_number').disabled = false;
+    document.getElementById('is_demo').checked = false;
+    document.getElementById('is_active').checked = true;
+    document.getElementById('number-modal').classList.add('active');
+}
+
+async function editNumber(phone) {
+    const resp = await sharedFetch(`${NUMBERS_API}/${encodeURIComponent(phone)}`);
+    const n = await resp.json();
+
+    document.getElementById('number-modal-title').textContent = 'Edit Number';
+    document.getElementById('edit-phone').value = phone;
+    document.getElementById('phone_number').value = n.phone_number;
+    document.getElementById('phone_number').disabled = true;
+    document.getElementById('business_name').value = n.business_name;
+    document.getElementById('business_type').value = n.business_type;
+    document.getElementById('greeting_name').value = n.greeting_name;
+    document.getElementById('system_prompt_id').value = n.system_prompt_id || '';
+    document.getElementById('keyword_corrections_id').value = n.keyword_corrections_id || '';
+    document.getElementById('is_demo').checked = n.is_demo;
+    document.getElementById('is_active').checked = n.is_active;
+    document.getElementById('number-modal').classList.add('active');
+}
+
+async function saveNumber(e) {
+    e.preventDefault();
+    const editPhone = document.getElementById('edit-phone').value;
+    const isEdit = !!editPhone;
+
+    const promptId = document.getElementById('system_prompt_id').value;
+    const keywordsId = document.getElementById('keyword_corrections_id').value;
+    const data = {
+        phone_number: document.getElementById('phone_number').value,
+        business_name: document.getElementById('business_name').value,
+        business_type: document.getElementById('business_type').value,
+        greeting_name: document.getElementById('greeting_name').value,
+        system_prompt_id: promptId ? parseInt(promptId) : null,
+        keyword_corrections_id: keywordsId ? parseInt(keywordsId) : null,
+        is_demo: document.getElementById('is_demo').checked,
+        is_active: document.getElementById('is_active').checked
+    };
+
+    const url = isEdit ? `${NUMBERS_API}/${encodeURIComponent(editPhone)}` : NUMBERS_API;
+    const method = isEdit ? 'PUT' : 'POST';
+
+    const resp = await whileBusy(submitButton(e), fetch(url, {
+        method,
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    }));
+
+    if (resp.ok) {
+        closeModal('number-modal');
+        // The response is the saved row; patch it in rather than reloading
+        upsert(numbersCache, withJoinedNames(await resp.json()), 'phone_number');
+        renderNumbers(numbersCache);
+    } else {
+        const err = await resp.json();
+        alert(err.detail || 'Error saving number');
+    }
+}
+
+async function deleteNumber(phone) {
+    if (!confirm(`Delete ${phone}?`)) return;
+    const resp = await fetch(`${NUMBERS_API}/${encodeURIComponent(phone)}`, { method: 'DELETE' });
+    if (resp.ok) {
+        renderNumbers(numbersCache.filter(n => n.phone_number !== phone));
+    } else {
+        alert('Error deleting number');
+    }
+}
+
+// ============ Prompts ============
+function renderPrompts(prompts) {
+    promptsCache = prompts;
+
+    // Update prompt dropdown
+    document.getElementById('system_prompt_id').replaceChildren(
+        new Option('-- No prompt (use default) --', ''),
+        ...prompts.map(p => new Option(p.name, p.id))
+    );
+
+    const tbody = document.getElementById('prompts-table');
+    if (prompts.length === 0) {
+        messageRow(tbody, 3, 'No prompts. Add one to get started.');
+        return;
+    }
+
+    renderRows(tbody, prompts, p => el('tr', {},
+        el('td', {}, el('strong', {}, p.name)),
+        el('td', { class: 'prompt-preview' }, p.content.replace(/\n/g, ' ').substring(0, 100) + '...'),
+        el('td', { class: 'actions' },
+            el('button', { class: 'btn-primary', onclick: () => editPrompt(p.id) }, 'Edit'),
+            el('button', { class: 'btn-danger', onclick: () => deletePrompt(p.id, p.name) }, 'Delete'))
+    ));
+}
+
+function showAddPromptModal() {
+    document.getElementById('prompt-modal-title').textContent = 'Add Prompt';
+    document.getElementById('prompt-form').reset();
+    document.getElementById('edit-prompt-id').value = '';
+    document.getElementById('prompt-modal').classList.add('active');
+}
+
+async function editPrompt(id) {
+    const resp = await sharedFetch(`${PROMPTS_API}/${id}`);
+    const p = await resp.json();
+
+    document.getElementById('prompt-modal-title').textContent = 'Edit Prompt';
+    document.getElementById('edit-prompt-id').value = id;
+    document.getElementById('prompt_name').value = p.name;
+    document.getElementById('prompt_content').value = p.content;
+    document.getElementById('prompt-modal').classList.add('active');
+}
+
+async function savePrompt(e) {
+    e.preventDefault();
+    const editId = document.getElementById('edit-prompt-id').value;
+    const isEdit = !!editId;
+
+    const data = {
+        name: document.getElementById('prompt_name').value,
+        content: document.getElementById('prompt_content').value
+    };
+
+    const url = isEdit ? `${PROMPTS_API}/${editId}` : PROMPTS_API;
+    const method = isEdit ? 'PUT' : 'POST';
+
+    const resp = await whileBusy(submitButton(e), fetch(url, {
+        method,
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    }));
+
+    if (resp.ok) {
+        closeModal('prompt-modal');
+        const row = await resp.json();
+        const renamed = isEdit && promptsCache.find(p => p.id === row.id)?.name !== row.name;
+        upsert(promptsCache, row, 'id');
+        renderPrompts(promptsCache.sort(byName));
+        if (renamed) renderNumbers(numbersCache.map(withJoinedNames)); // Update prompt names
+    } else {
+        const err = await resp.json();
+        alert(err.detail || 'Error saving prompt');
+    }
+}
+
+async function deletePrompt(id, name) {
+    if (!confirm(`Delete prompt "${name}"? Numbers using it will revert to default.`)) return;
+    const resp = await fetch(`${PROMPTS_API}/${id}`, { method: 'DELETE' });
+    if (resp.ok) {
+        // Server unlinks numbers that used it; mirror that locally
+        renderPrompts(promptsCache.filter(p => p.id !== id));
+        renderNumbers(numbersCache.map(n =>
+            n.system_prompt_id === id ? withJoinedNames({ ...n, system_prompt_id: null }) : n));
+    } else {
+        alert('Error deleting prompt');
+    }
+}
+
+// ============ Keywords ============
+function renderKeywords(keywords) {
+    keywordsCache = keywords;
+
+    // Update keywords dropdown
+    document.getElementById('keyword_corrections_id').replaceChildren(
+        new Option('-- No corrections --', ''),
+        ...keywords.map(k => new Option(k.name, k.id))
+    );
+
+    const tbody = document.getElementById('keywords-table');
+    if (keywords.length === 0) {
+        messageRow(tbody, 3, 'No keyword sets. Add one to get started.');
+        return;
+    }
+
+    renderRows(tbody, keywords, k => {
+        const count = Object.keys(k.corrections).length;
+        const preview = Object.entries(k.corrections).slice(0, 3)
+            .map(([wrong, right]) => `${wrong}→${right}`).join(', ');
+        return el('tr', {},
+            el('td', {}, el('strong', {}, k.name)),
+            el('td', { class: 'prompt-preview' }, `${count} corrections: ${preview}${count > 3 ? '...' : ''}`),
+            el('td', { class: 'actions' },
+                el('button', { class: 'btn-primary', onclick: () => editKeywords(k.id) }, 'Edit'),
+                el('button', { class: 'btn-danger', onclick: () => deleteKeywords(k.id, k.name) }, 'Delete'))
+        );
+    });
+}
+
+function showAddKeywordsModal() {
+    document.getElementById('keywords-modal-title').textContent = 'Add Keyword Set';
+    document.getElementById('keywords-form').reset();
+    document.getElementById('edit-keywords-id').value = '';
+    document.getElementById('keywords-modal').classList.add('active');
+}
+
+async function editKeywords(id) {
+    const resp = await sharedFetch(`${KEYWORDS_API}/${id}`);
+    const k = await resp.json();
+
+    document.getElementById('keywords-modal-title').textContent = 'Edit Keyword Set';
+    document.getElementById('edit-keywords-id').value = id;
+    document.getElementById('keywords_name').value = k.name;
+    document.getElementById('keywords_corrections').value = JSON.stringify(k.corrections, null, 2);
+    document.getElementById('keywords-modal').classList.add('active');
+}
+
+async function saveKeywords(e) {
+    e.preventDefault();
+    const editId = document.getElementById('edit-keywords-id').value;
+    const isEdit = !!editId;
+
+    let corrections;
+    try {
+        corrections = JSON.parse(document.getElementById('keywords_corrections').value);
+    } catch (err) {
+        alert('Invalid JSON format. Please check the corrections field.');
+        return;
+    }
+
+    const data = {
+        name: document.getElementById('keywords_name').value,
+        corrections: corrections
+    };
+
+    const url = isEdit ? `${KEYWORDS_API}/${editId}` : KEYWORDS_API;
+    const method = isEdit ? 'PUT' : 'POST';
+
+    const resp = await whileBusy(submitButton(e), fetch(url, {
+        method,
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    }));
+
+    if (resp.ok) {
+        closeModal('keywords-modal');
+        const row = await resp.json();
+        const renamed = isEdit && keywordsCache.find(k => k.id === row.id)?.name !== row.name;
+        upsert(keywordsCache, row, 'id');
+        renderKeywords(keywordsCache.sort(byName));
+        if (renamed) renderNumbers(numbersCache.map(withJoinedNames)); // Update keywords names
+    } else {
+        const err = await resp.json();
+        alert(err.detail || 'Error saving keyword set');
+    }
+}
+
+async function deleteKeywords(id, name) {
+    if (!confirm(`Delete keyword set "${name}"? Numbers using it will have no corrections.`)) return;
+    const resp = await fetch(`${KEYWORDS_API}/${id}`, { method: 'DELETE' });
+    if (resp.ok) {
+        renderKeywords(keywordsCache.filter(k => k.id !== id));
+        renderNumbers(numbersCache.map(n =>
+            n.keyword_corrections_id === id ? withJoinedNames({ ...n, keyword_corrections_id: null }) : n));
+    } else {
+        alert('Error deleting keyword set');
+    }
+}
+
+// ============ Twilio Numbers ============
+async function loadTwilioNumbers() {
+    const tbody = document.getElementById('twilio-numbers-table');
+    messageRow(tbody, 5, 'Loading...');
+
+    try {
+        const resp = await cachedFetch(`${TWILIO_API}/numbers`, renderTwilioNumbers);
+        if (!resp.ok && resp.status !== 304) {
+            const err = await resp.json();
+            messageRow(tbody, 5, err.detail || 'Error loading Twilio numbers');
+        }
+    } catch (err) {
+        messageRow(tbody, 5, 'Error connecting to Twilio API');
+    }
+}
+
+function renderTwilioNumbers(numbers) {
+    const tbody = document.getElementById('twilio-numbers-table');
+    unconfiguredTwilioSids = numbers
+        .filter(n => !(n.voice_url && n.voice_url.includes('runpod')))
+        .map(n => n.sid);
+    if (numbers.length === 0) {
+        messageRow(tbody, 5, 'No numbers in your Twilio account.');
+        return;
+    }
+
+    renderRows(tbody, numbers, n => {
+        const isConfigured = n.voice_url && n.voice_url.includes('runpod');
+        return el('tr', {},
+            el('td', {}, el('strong', {}, n.phone)),
+            el('td', {}, n.region || '-'),
+            el('td', {},
+                el('span', { id: `name-${n.sid}` }, n.friendly_name || '-'),
+                el('button', {
+                    style: 'padding: 2px 6px; font-size: 11px; margin-left: 5px;',
+                    onclick: () => editTwilioName(n.sid, n.friendly_name || ''),
+                }, 'Edit')),
+            el('td', {
+                style: 'max-width: 200px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;',
+                title: n.voice_url || '',
+            }, n.voice_url || el('em', { style: 'color:#999' }, 'Not configured')),
+            el('td', { class: 'actions' },
+                el('button', { class: 'btn-primary', onclick: () => importTwilioNumber(n.phone) }, 'Import'),
+                !isConfigured && el('button', {
+                    class: 'btn-success',
+                    onclick: e => configureTwilioNumber(n.sid, e.currentTarget),
+                }, 'Set Webhook'))
+        );
+    });
+}
+
+async function searchTwilioNumbers() {
+    const country = document.getElementById('twilio-country').value;
+    const areaCode = document.getElementById('twilio-area-code').value;
+
+    const resultsDiv = document.getElementById('twilio-search-results');
+    const tbody = document.getElementById('twilio-search-table');
+
+    resultsDiv.style.display = 'block';
+    messageRow(tbody, 3, 'Searching...');
+
+    try {
+        const params = new URLSearchParams({ country, area_code: areaCode });
+        const resp = await fetch(`${TWILIO_API}/search?${params}`);
+        if (!resp.ok) {
+            const err = await resp.json();
+            messageRow(tbody, 3, err.detail || 'Error searching numbers');
+            return;
+        }
+
+        const numbers = await resp.json();
+        if (numbers.length === 0) {
+            messageRow(tbody, 3, 'No numbers available in that area code.');
+            return;
+        }
+
+        renderRows(tbody, numbers, n => el('tr', {},
+            el('td', {}, el('strong', {}, n.phone)),
+            el('td', {}, `${n.locality || ''}, ${n.region || ''}`),
+            el('td', { class: 'actions' },
+                el('button', { class: 'btn-success', onclick: e => buyTwilioNumber(n.phone, e.currentTarget) }, 'Buy'))
+        ));
+    } catch (err) {
+        messageRow(tbody, 3, 'Error connecting to Twilio API');
+    }
+}
+
+async function buyTwilioNumber(phone, btn) {
+    if (!confirm(`Purchase ${phone} for ~$1.15 CAD/month?\n\nWebhook will be auto-configured to this server.`)) return;
+
+    try {
+        const resp = await whileBusy(btn, fetch(`${TWILIO_API}/buy`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ phone_number: phone })
+        }));
+
+        if (resp.ok) {
+            const result = await resp.json();
+            alert(`Purchased ${result.phone}!\n\nWebhook set to: ${result.voice_url}`);
+            loadTwilioNumbers();
+            document.getElementById('twilio-search-results').style.display = 'none';
+        } else {
+            const err = await resp.json();
+            alert(err.detail || 'Error purchasing number');
+        }
+    } catch (err) {
+        alert('Error connecting to Twilio API');
+    }
+}
+
+async function configureTwilioNumber(sid, btn) {
+    if (!confirm('Configure this number to receive calls on this BuddyHelps server?')) return;
+
+    try {
+        const resp = await whileBusy(btn, fetch(`${TWILIO_API}/configure/${encodeURIComponent(sid)}`, { method: 'POST' }));
+
+        if (resp.ok) {
+            const result = await resp.json();
+            alert(`Configured ${result.phone}!\n\nWebhook set to: ${result.voice_url}`);
+            loadTwilioNumbers();
+        } else {
+            const err = await resp.json();
+            alert(err.detail || 'Error configuring number');
+        }
+    } catch (err) {
+        alert('Error connecting to Twilio API');
+    }
+}
+
+async function configureAllTwilioNumbers(btn) {
+    if (unconfiguredTwilioSids.length === 0) {
+        alert('All numbers already point at this server.');
+        return;
+    }
+    if (!confirm(`Configure ${unconfiguredTwilioSids.length} number(s) to receive calls on this BuddyHelps server?`)) return;
+
+    try {
+        const resp = await whileBusy(btn, fetch(`${TWILIO_API}/configure-bulk`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ sids: unconfiguredTwilioSids })
+        }));
+
+        if (resp.ok) {
+            const results = await resp.json();
+            const failed = results.filter(r => r.status !== 'configured');
+            alert(failed.length === 0
+                ? `Configured ${results.length} number(s).`
+                : `Configured ${results.length - failed.length} of ${results.length}.\n\nFailed:\n` +
+                  failed.map(r => `${r.sid}: ${r.error}`).join('\n'));
+            loadTwilioNumbers();
+        } else {
+            const err = await resp.json();
+            alert(err.detail || 'Error configuring numbers');
+        }
+    } catch (err) {
+        alert('Error connecting to Twilio API');
+    }
+}
+
+function importTwilioNumber(phone) {
+    // Pre-fill the add number modal with this phone
+    showAddNumberModal();
+    document.getElementById('phone_number').value = phone;
+}
+
+async function editTwilioName(sid, currentName) {
+    const newName = prompt('Enter new friendly name:', currentName);
+    if (newName === null || newName === currentName) return;
+
+    try {
+        const resp = await fetch(`${TWILIO_API}/numbers/${encodeURIComponent(sid)}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ friendly_name: newName })
+        });
+
+        if (resp.ok) {
+            const result = await resp.json();
+            document.getElementById(`name-${sid}`).textContent = result.friendly_name;
+        } else {
+            const err = await resp.json();
+            alert(err.detail || 'Error updating name');
+        }
+    } catch (err) {
+        alert('Error connecting to Twilio API');
+    }
+}
+
+// ============ Local cache ============
+// Last good response per URL lives in IndexedDB: render it immediately,
+// then revalidate with If-None-Match and re-render only on a 200.
+const CACHE_DB = 'buddyhelps-admin';
+const CACHE_STORE = 'http-cache';
+let cacheDb = null;
+
+function openCacheDb() {
+    if (!cacheDb) {
+        cacheDb = new Promise((resolve, reject) => {
+            const req = indexedDB.open(CACHE_DB, 1);
+            req.onupgradeneeded = () => req.result.createObjectStore(CACHE_STORE);
+            req.onsuccess = () => resolve(req.result);
+            req.onerror = () => reject(req.error);
+        });
+    }
+    return cacheDb;
+}
+
+async function cacheOp(mode, op) {
+    const db = await openCacheDb();
+    return new Promise((resolve, reject) => {
+        const req = op(db.transaction(CACHE_STORE, mode).objectStore(CACHE_STORE));
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+}
+
+// Returns the network response so callers can report errors; a cache
+// failure (private browsing, quota) just falls back to a plain fetch
+async function cachedFetch(url, render) {
+    const cached = await cacheOp('readonly', store => store.get(url)).catch(() => undefined);
+    if (cached) render(cached.body);
+
+    const resp = await fetch(url, cached ? { headers: { 'If-None-Match': cached.etag } } : {});
+    if (resp.ok) {
+        const body = await resp.json();
+        render(body);
+        const etag = resp.headers.get('ETag');
+        if (etag) cacheOp('readwrite', store => store.put({ etag, body }, url)).catch(() => {});
+    }
+    return resp;
+}
+
+// ============ Utils ============
+// Replace the cached row with the same key, or add a new one at the top
+function upsert(list, row, key) {
+    const idx = list.findIndex(x => x[key] === row[key]);
+    if (idx >= 0) list[idx] = row;
+    else list.unshift(row);
+}
+
+// Same order as the server's ORDER BY name
+function byName(a, b) {
+    return a.name < b.name ? -1 : a.name > b.name ? 1 : 0;
+}
+
+// Fill in the names the list endpoint joins server-side
+function withJoinedNames(n) {
+    const prompt = promptsCache.find(p => p.id === n.system_prompt_id);
+    const keywords = keywordsCache.find(k => k.id === n.keyword_corrections_id);
+    return { ...n, prompt_name: prompt ? prompt.name : null, keyword_set_name: keywords ? keywords.name : null };
+}
+
+// Coalesce concurrent GETs for the same URL (double-clicked Edit, a save
+// refreshing a list that is still loading) into one request. Each caller
+// gets its own clone since a response body can only be read once.
+const inflight = new Map();
+
+function sharedFetch(url) {
+    let pending = inflight.get(url);
+    if (!pending) {
+        pending = fetch(url).finally(() => inflight.delete(url));
+        inflight.set(url, pending);
+    }
+    return pending.then(resp => resp.clone());
+}
+
+// Build an element. Strings are appended as text nodes, so API data is
+// never parsed as HTML; on* attributes become event listeners and falsy
+// children are skipped.
+function el(tag, attrs, ...children) {
+    const node = document.createElement(tag);
+    for (const [key, value] of Object.entries(attrs)) {
+        if (key.startsWith('on')) node.addEventListener(key.slice(2), value);
+        else node.setAttribute(key, value);
+    }
+    node.append(...children.filter(c => c || c === 0));
+    return node;
+}
+
+// Build all rows off-document, then swap them in with a single DOM write
+function renderRows(tbody, items, buildRow) {
+    const frag = document.createDocumentFragment();
+    for (const item of items) frag.appendChild(buildRow(item));
+    tbody.replaceChildren(frag);
+}
+
+function messageRow(tbody, colspan, text) {
+    tbody.replaceChildren(el('tr', {}, el('td', { colspan, class: 'empty' }, text)));
+}
+
+// Keep a button disabled until its request settles so a double-click
+// can't send a second write (or buy a second number)
+async function whileBusy(btn, request) {
+    if (btn) btn.disabled = true;
+    try {
+        return await request;
+    } finally {
+        if (btn) btn.disabled = false;
+    }
+}
+
+function submitButton(e) {
+    return e.submitter || e.target.querySelector('button[type=submit]');
+}
+
+function closeModal(modalId) {
+    document.getElementById(modalId).classList.remove('active');
+}
+
+// Load on page load (in parallel so the slow Twilio call doesn't hold up the rest)
+Promise.all([loadAll(), loadTwilioNumbers()]).catch(console.error);
@@ -16,6 +16,11 @@ logger = logging.getLogger(__name__)
 _model = None
 _is_warmed_up = False
 
+# Input lengths (seconds) exercised during warmup. The TDT greedy decoder
+# captures a CUDA graph per input shape, so each bucket is captured up front
+# instead of on the first live call that hits it.
+WARMUP_DURATIONS = (1.0, 2.0, 4.0)
+
 
 def load_model(model_name: str = "nvidia/parakeet-tdt-0.6b-v2"):
     """Load Parakeet STT model."""
@@ -28,8 +33,22 @@ def load_model(model_name: str = "nvidia/parakeet-tdt-0.6b-v2"):
 
     import nemo.collections.asr as nemo_asr
 
-    _model = nemo_asr.models.ASRModel.from_pretrained(model_name)
-    _model.cuda().eval()
+    from . import gpu_utils
+
+    # Restore on CPU, then stage weights to GPU via pinned memory
+    _model = nemo_asr.models.ASRModel.from_pretrained(
+        model_name, map_location=torch.device("cpu")
+    )
+    gpu_utils.to_device_pinned(_model)
+    _model.eval()
+
+    # Decode through CUDA graphs (captured during warmup, replayed per call)
+    from omegaconf import open_dict
+    decoding_cfg = _model.cfg.decoding
+    with open_dict(decoding_cfg):
+        decoding_cfg.strategy = "greedy_batch"
+        decoding_cfg.greedy.use_cuda_graph_decoder = True
+    _model.change_decoding_strategy(decoding_cfg)
 
     logger.info("Parakeet model loaded successfully")
     return _model
@@ -41,35 +60,59 @@ def warmup(model=None, num_runs: int = 3):
 
     CRITICAL: First inference compiles CUDA graphs (~850ms).
     After warmup, inference runs at 34-38ms.
+
+    Runs each length in WARMUP_DURATIONS so the decoder graph for every
+    bucket is captured here rather than on a live call.
     """
     global _is_warmed_up
 
     if model is None:
         model = load_model()
 
-    logger.info(f"Warming up Parakeet ({num_runs} runs)...")
+    logger.info(f"Warming up Parakeet ({num_runs} runs x {len(WARMUP_DURATIONS)} lengths)...")
 
-    # Create dummy audio (1 second of silence)
     import soundfile as sf
     import tempfile
     import os
 
     sample_rate = 16000
-    duration = 1.0
-    warmup_audio = np.zeros(int(sample_rate * duration), dtype=np.float32)
-
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-        warmup_path = f.name
-        sf.write(warmup_path, warmup_audio, sample_rate)
+    warmup_paths = []
 
     try:
-        for i in range(num_runs):
+        # Create dummy audio (silence) for each bucketed length
+        for duration in WARMUP_DURATIONS:
+            warmup_audio = np.zeros(int(sample_rate * duration), dtype=np.float32)
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+                warmup_paths.append(f.name)
+                sf.write(f.name, warmup_audio, sample_rate)
+
+        for duration, warmup_path in zip(WARMUP_DURATIONS, warmup_paths):
+            # First run goes through transcribe(): initializes cuBLAS/cuDNN
+            # handles and captures the decoder graph for this bucket
             start = time.perf_counter()
             model.transcribe([warmup_path], batch_size=1)
             elapsed = (time.perf_counter() - start) * 1000
-            logger.info(f"  Warmup {i+1}/{num_runs}: {elapsed:.1f}ms")
+            logger.info(f"  Warmup {duration:.0f}s 1/{num_runs} (capture): {elapsed:.1f}ms")
+
+            # Remaining runs replay the captured graph straight from device
+            # tensors, skipping transcribe()'s manifest/dataloader overhead
+            signal = torch.zeros((1, int(sample_rate * duration)), device=model.device)
+            signal_length = torch.tensor([signal.shape[1]], device=model.device)
+            for i in range(1, num_runs):
+                start = time.perf_counter()
+                with torch.inference_mode():
+                    encoded, encoded_length = model(
+                        input_signal=signal, input_signal_length=signal_length
+                    )
+                    model.decoding.rnnt_decoder_predictions_tensor(
+                        encoder_output=encoded, encoded_lengths=encoded_length
+                    )
+                torch.cuda.current_stream().synchronize()
+                elapsed = (time.perf_counter() - start) * 1000
+                logger.info(f"  Warmup {duration:.0f}s {i+1}/{num_runs} (replay): {elapsed:.1f}ms")
     finally:
-        os.unlink(warmup_path)
+        for warmup_path in warmup_paths:
+            os.unlink(warmup_path)
 
     _is_warmed_up = True
     logger.info("Parakeet warmup complete - now running at optimal speed")
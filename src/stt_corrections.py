@@ -4,22 +4,73 @@ STT Post-Processing: Industry-specific keyword corrections.
 Phone audio quality causes STT to mishear domain-specific words.
 This module applies corrections before sending to LLM.
 
-Performance: Sub-millisecond (just regex).
+Performance: Sub-millisecond (one compiled regex per keyword set).
 """
 import re
 import logging
-from typing import Dict
+from typing import Dict, Union
 
 logger = logging.getLogger(__name__)
 
 
-def apply_corrections(text: str, corrections: Dict[str, str]) -> str:
+class KeywordCorrector:
+    """
+    A keyword set compiled into one case-insensitive alternation.
+
+    Built once per set (get_config_for_call caches it with the call config)
+    so each transcript is scanned in a single pass instead of once per
+    correction. Longer keywords are tried first, so "hot water tank" wins
+    over "water tank" at the same position. Replacements are not rescanned.
+    """
+
+    __slots__ = ("corrections", "_lookup", "_pattern")
+
+    def __init__(self, corrections: Dict[str, str]):
+        self.corrections = corrections
+        self._lookup = {wrong.lower(): right for wrong, right in corrections.items()}
+        self._pattern = None
+        if corrections:
+            alternation = "|".join(
+                re.escape(wrong) for wrong in sorted(corrections, key=len, reverse=True)
+            )
+            self._pattern = re.compile(rf'\b(?:{alternation})\b', re.IGNORECASE)
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def apply(self, text: str) -> str:
+        """Return text with every keyword replaced (see apply_corrections)."""
+        if self._pattern is None or not text:
+            return text
+
+        changes = []
+
+        def replace(match: re.Match) -> str:
+            wrong = match.group(0)
+            right = self._lookup[wrong.lower()]
+            changes.append(f'"{wrong}" -> "{right}"')
+            return right
+
+        corrected = self._pattern.sub(replace, text)
+
+        if changes:
+            logger.info(f"STT corrections applied: {', '.join(changes)}")
+            logger.debug(f"Original: {text}")
+            logger.debug(f"Corrected: {corrected}")
+
+        return corrected
+
+
+def apply_corrections(
+    text: str, corrections: Union[Dict[str, str], KeywordCorrector]
+) -> str:
     """
     Apply industry-specific corrections to STT output.
 
     Args:
         text: Raw STT transcript
-        corrections: Dict of {wrong_word: correct_word}
+        corrections: Dict of {wrong_word: correct_word}, or a KeywordCorrector
+            already compiled from one (preferred on the call path)
 
     Returns:
         Corrected text
@@ -27,21 +78,7 @@ def apply_corrections(text: str, corrections: Dict[str, str]) -> str:
     if not corrections or not text:
         return text
 
-    corrected = text
-    changes = []
-
-    for wrong, right in corrections.items():
-        # Case-insensitive word boundary replacement
-        pattern = re.compile(rf'\b{re.escape(wrong)}\b', re.IGNORECASE)
-
-        # Check if there's a match before replacing
-        if pattern.search(corrected):
-            corrected = pattern.sub(right, corrected)
-            changes.append(f'"{wrong}" -> "{right}"')
-
-    if changes:
-        logger.info(f"STT corrections applied: {', '.join(changes)}")
-        logger.debug(f"Original: {text}")
-        logger.debug(f"Corrected: {corrected}")
+    if not isinstance(corrections, KeywordCorrector):
+        corrections = KeywordCorrector(corrections)
 
-    return corrected
+    return corrections.apply(text)
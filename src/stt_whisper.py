@@ -11,7 +11,7 @@ import time
 import threading
 import tempfile
 import os
-from typing import Optional, List
+from typing import Optional, List, Union
 from dataclasses import dataclass, field
 import numpy as np
 
@@ -99,29 +99,20 @@ class WhisperPool:
 
         logger.info(f"Warming up Whisper pool ({num_runs} runs per instance)...")
 
-        # Create dummy audio (1 second of silence at 16kHz)
-        import soundfile as sf
-        sample_rate = 16000
-        warmup_audio = np.zeros(sample_rate, dtype=np.float32)
-
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            warmup_path = f.name
-            sf.write(warmup_path, warmup_audio, sample_rate)
-
-        try:
-            for instance in self.instances:
-                for run in range(num_runs):
-                    start = time.perf_counter()
-                    segments, _ = instance.model.transcribe(
-                        warmup_path,
-                        beam_size=1,
-                        vad_filter=False,
-                    )
-                    list(segments)  # Consume generator
-                    elapsed = (time.perf_counter() - start) * 1000
-                    logger.info(f"  Instance {instance.index} warmup {run+1}: {elapsed:.1f}ms")
-        finally:
-            os.unlink(warmup_path)
+        # Dummy audio (1 second of silence at 16kHz), passed as an array
+        warmup_audio = np.zeros(16000, dtype=np.float32)
+
+        for instance in self.instances:
+            for run in range(num_runs):
+                start = time.perf_counter()
+                segments, _ = instance.model.transcribe(
+                    warmup_audio,
+                    beam_size=1,
+                    vad_filter=False,
+                )
+                list(segments)  # Consume generator
+                elapsed = (time.perf_counter() - start) * 1000
+                logger.info(f"  Instance {instance.index} warmup {run+1}: {elapsed:.1f}ms")
 
         self._is_warmed_up = True
         logger.info("Whisper pool warmup complete")
@@ -158,14 +149,14 @@ class WhisperPool:
 
     def transcribe(
         self,
-        audio_path: str,
+        audio: Union[str, np.ndarray],
         language: str = "en",
         beam_size: int = 1,
         vad_filter: bool = True,
         vad_parameters: Optional[dict] = None,
     ) -> str:
         """
-        Transcribe audio file to text.
+        Transcribe an audio file path or 16kHz mono float32 array to text.
         Automatically selects an available instance.
         """
         if not self._is_loaded:
@@ -179,7 +170,7 @@ class WhisperPool:
             start = time.perf_counter()
 
             segments, info = instance.model.transcribe(
-                audio_path,
+                audio,
                 language=language,
                 beam_size=beam_size,
                 vad_filter=vad_filter,
@@ -214,7 +205,13 @@ class WhisperPool:
             os.unlink(temp_path)
 
     def transcribe_numpy(self, audio: np.ndarray, sample_rate: int = 16000) -> str:
-        """Transcribe audio from numpy array."""
+        """
+        Transcribe audio from numpy array.
+        16kHz input goes straight to the model; other rates via temp file.
+        """
+        if sample_rate == 16000:
+            return self.transcribe(np.asarray(audio, dtype=np.float32))
+
         import soundfile as sf
 
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
@@ -29,6 +29,13 @@ VOICES = {
 
 DEFAULT_VOICE = "af_heart"
 
+# Text used to build warmup inputs of a given length (trimmed to whole words)
+_WARMUP_TEXT = (
+    "Hi, thanks for calling. I'm sorry to hear about the leak under your sink. "
+    "Can you tell me your address and a good number to reach you, and I'll have "
+    "someone call you back today to set up a time to come take a look at it."
+)
+
 
 def load_model(lang_code: str = "a"):
     """
@@ -45,13 +52,48 @@ def load_model(lang_code: str = "a"):
     logger.info("Loading Kokoro TTS...")
 
     from kokoro import KPipeline
+    from . import gpu_utils
 
-    _pipeline = KPipeline(lang_code=lang_code)
+    # Build on CPU, then stage weights to GPU via pinned memory
+    _pipeline = KPipeline(lang_code=lang_code, device="cpu")
+    gpu_utils.to_device_pinned(_pipeline.model)
 
     logger.info("Kokoro TTS loaded successfully")
     return _pipeline
 
 
+def warmup(voices=None, lengths=(20, 60, 120), num_runs: int = 2):
+    """
+    Warm synthesis for every voice and a few representative text lengths.
+
+    Loads each voice pack and runs the model on short/medium/long inputs so
+    kernel selection for each output shape happens here instead of on the
+    first reply spoken in a given voice.
+
+    Args:
+        voices: Voice presets to warm (defaults to all of VOICES)
+        lengths: Approximate input lengths in characters
+        num_runs: Syntheses per (voice, length) combination
+    """
+    if _pipeline is None:
+        load_model()
+
+    voices = list(voices) if voices is not None else list(VOICES)
+
+    for voice in voices:
+        for length in lengths:
+            text = _WARMUP_TEXT[:length].rsplit(" ", 1)[0]
+            timings = []
+            for _ in range(num_runs):
+                start = time.perf_counter()
+                synthesize(text, voice=voice)
+                timings.append((time.perf_counter() - start) * 1000)
+            logger.info(
+                f"  TTS warmup {voice} len={length}: "
+                + ", ".join(f"{t:.1f}ms" for t in timings)
+            )
+
+
 def synthesize(
     text: str,
     voice: str = DEFAULT_VOICE,
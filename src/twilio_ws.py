@@ -4,19 +4,18 @@ Twilio Media Streams WebSocket handler.
 Handles real-time bidirectional audio streaming with Twilio.
 """
 import asyncio
-import json
 import logging
 import time
-from typing import Optional
+from typing import List, Optional
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
 from .audio_utils import (
-    AudioBuffer,
     detect_speech_end,
-    mulaw_to_pcm16k,
+    MulawStreamDecoder,
+    pcm_bytes_to_float32,
     pcm_to_mulaw8k,
-    pcm_to_wav_bytes,
 )
 from .call_state import CallState, CallStatus, call_manager
 from .stt_corrections import apply_corrections
@@ -39,6 +38,9 @@ SILENCE_DURATION_MS = 700        # ms of silence before processing
 MIN_SPEECH_MS = 300              # Minimum speech duration to process
 CHUNK_DURATION_MS = 20           # Twilio sends 20ms chunks
 
+# Marks the end of a run of queued media frames (the queue is empty)
+_DRAINED = object()
+
 
 class TwilioMediaHandler:
     """Handles a single Twilio Media Stream WebSocket connection."""
@@ -46,7 +48,7 @@ class TwilioMediaHandler:
     def __init__(self, websocket: WebSocket):
         self.websocket = websocket
         self.call_state: Optional[CallState] = None
-        self.audio_buffer = AudioBuffer(min_duration_ms=100)  # Small buffer, we use VAD
+        self.decoder = MulawStreamDecoder()  # Inbound audio, seams interpolated
         self.stream_sid: Optional[str] = None
 
         # Voice activity detection state
@@ -64,8 +66,15 @@ class TwilioMediaHandler:
             await self.websocket.accept()
             logger.info("Twilio WebSocket connected")
 
-            async for message in self.websocket.iter_text():
-                await self.handle_message(json.loads(message))
+            # Messages are read by a separate task so that media frames which
+            # arrive while a turn is being processed can be decoded as a batch
+            queue: asyncio.Queue = asyncio.Queue()
+            reader = asyncio.create_task(self.read_messages(queue))
+            try:
+                await self.dispatch_messages(queue)
+                await reader  # surface any read error
+            finally:
+                reader.cancel()
 
         except WebSocketDisconnect:
             logger.info(f"WebSocket disconnected: {self.stream_sid}")
@@ -74,6 +83,34 @@ class TwilioMediaHandler:
         finally:
             await self.cleanup()
 
+    async def read_messages(self, queue: asyncio.Queue):
+        """Queue parsed Twilio messages; None marks the end of the stream."""
+        try:
+            async for message in self.websocket.iter_text():
+                queue.put_nowait(orjson.loads(message))
+        finally:
+            queue.put_nowait(None)
+
+    async def dispatch_messages(self, queue: asyncio.Queue):
+        """Handle queued messages in order, batching consecutive media frames."""
+        while True:
+            msg = await queue.get()
+
+            media = []
+            while msg is not None and msg.get("event") == "media":
+                media.append(msg)
+                if queue.empty():
+                    msg = _DRAINED
+                    break
+                msg = queue.get_nowait()
+            if media:
+                await self.handle_media_batch(media)
+
+            if msg is None:
+                return
+            if msg is not _DRAINED:
+                await self.handle_message(msg)
+
     async def handle_message(self, msg: dict):
         """Route incoming Twilio messages."""
         event = msg.get("event")
@@ -114,7 +151,7 @@ class TwilioMediaHandler:
         # Register stream
         call_manager.register_stream(self.stream_sid, call_sid)
         self.call_state.status = CallStatus.IN_PROGRESS
-        self.call_state.answered_at = time.time()
+        self.call_state.answered_at = time.time_ns()
 
         # Load business config from database
         await self.load_business_config()
@@ -133,7 +170,7 @@ class TwilioMediaHandler:
             self.call_state.owner_name = config.get("owner_name", "")
             self.call_state.greeting_name = config.get("greeting_name", "Benny")
             self.call_state.system_prompt = config.get("system_prompt")
-            self.call_state.keyword_corrections = config.get("keyword_corrections", {})
+            self.call_state.keyword_corrections = config["keyword_corrector"]
             self.call_state.plumber_phone = config.get("plumber_phone", "")
             self.call_state.plumber_email = config.get("plumber_email", "")
             self.call_state.is_demo = config.get("is_demo", False)
@@ -158,18 +195,26 @@ class TwilioMediaHandler:
 
     async def handle_media(self, msg: dict):
         """Handle incoming audio from customer."""
+        await self.handle_media_batch([msg])
+
+    async def handle_media_batch(self, msgs: List[dict]):
+        """Handle a run of media messages with one decode pass."""
         if not self.call_state or self.call_state.status != CallStatus.IN_PROGRESS:
             return
 
-        media = msg.get("media", {})
-        payload = media.get("payload")  # Base64 mulaw audio
+        # Base64 mulaw audio
+        payloads = [msg.get("media", {}).get("payload") for msg in msgs]
+        payloads = [payload for payload in payloads if payload]
 
-        if not payload:
+        if not payloads:
             return
 
-        # Convert to PCM
-        pcm = mulaw_to_pcm16k(payload)
+        # Convert to PCM, then run VAD per 20ms frame as before
+        for pcm in self.decoder.decode(payloads):
+            await self.handle_pcm(pcm)
 
+    async def handle_pcm(self, pcm: bytes):
+        """Run voice activity detection on one decoded frame."""
         # Voice activity detection
         is_silence = detect_speech_end(pcm, threshold=SILENCE_THRESHOLD)
 
@@ -203,13 +248,12 @@ class TwilioMediaHandler:
         start_time = time.time()
 
         try:
-            # Convert to WAV for STT
-            pcm_bytes = bytes(self.speech_chunks)
-            wav_bytes = pcm_to_wav_bytes(pcm_bytes, sample_rate=16000)
+            # Float32 samples for STT (no WAV round trip)
+            audio = pcm_bytes_to_float32(self.speech_chunks)
 
             # STT
             stt_start = time.time()
-            text_raw = stt.transcribe_bytes(wav_bytes)
+            text_raw = stt.transcribe_numpy(audio, sample_rate=16000)
             stt_ms = (time.time() - stt_start) * 1000
             logger.info(f"STT ({stt_ms:.0f}ms): {text_raw}")
 
@@ -233,12 +277,13 @@ class TwilioMediaHandler:
 
             # LLM
             llm_start = time.time()
-            response = llm.generate(
+            response = await llm.batcher.generate(
                 messages=self.call_state.conversation_history,
                 business_name=self.call_state.business_name,
                 owner_name=self.call_state.owner_name,
                 greeting_name=self.call_state.greeting_name,
                 system_prompt=self.call_state.system_prompt,
+                session_id=self.call_state.call_sid,
             )
             llm_ms = (time.time() - llm_start) * 1000
             logger.info(f"LLM ({llm_ms:.0f}ms): {response}")
@@ -300,7 +345,7 @@ class TwilioMediaHandler:
                 "payload": mulaw_b64
             }
         }
-        await self.websocket.send_json(message)
+        await self.send_message(message)
 
     async def send_mark(self, name: str):
         """Send mark event to track playback."""
@@ -314,7 +359,16 @@ class TwilioMediaHandler:
                 "name": name
             }
         }
-        await self.websocket.send_json(message)
+        await self.send_message(message)
+
+    async def send_message(self, message: dict):
+        """
+        Serialize with orjson and send as a text frame (Twilio rejects binary).
+
+        Payloads are already base64 str (b64encode_as_string), so the only
+        copy left is orjson's UTF-8 output back to str for send_text.
+        """
+        await self.websocket.send_text(orjson.dumps(message).decode())
 
     async def handle_mark(self, msg: dict):
         """Handle mark event - TTS playback completed."""
@@ -343,6 +397,7 @@ class TwilioMediaHandler:
         if self.call_state:
             call_sid = self.call_state.call_sid
             call_manager.end_call(call_sid)
+            llm.end_session(call_sid)
             # Note: Don't remove call yet - post_call.py will handle that after processing
             logger.info(f"Call cleanup: {call_sid}")
 
@@ -0,0 +1,87 @@
+"""
+Admin API tests: list cache and conditional GETs (SQLite only, no models needed).
+
+Run with: pytest tests/test_admin.py
+"""
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("httpx")  # TestClient transport
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """TestClient over the admin router, backed by a fresh database."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from src import admin, database
+
+    database.close_all()
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "buddyhelps.db"))
+    database.invalidate_config()
+    database.init_db()
+    admin._invalidate("numbers", "prompts", "keywords")
+
+    app = FastAPI()
+    app.include_router(admin.router)
+    yield TestClient(app)
+    database.close_all()
+
+
+class TestListCache:
+    """Test that writes clear the cached lists."""
+
+    def test_write_invalidates(self, client):
+        names = [p["name"] for p in client.get("/api/prompts").json()]
+        assert "Custom" not in names
+
+        client.post("/api/prompts", json={"name": "Custom", "content": "Hi"})
+        assert "Custom" in [p["name"] for p in client.get("/api/prompts").json()]
+
+    def test_linked_write_invalidates_numbers(self, client):
+        """Renaming a prompt refreshes the joined prompt_name on numbers."""
+        prompt_id = client.get("/api/prompts").json()[0]["id"]
+        client.post("/api/numbers", json={
+            "phone_number": "+15550000001", "business_name": "Acme", "system_prompt_id": prompt_id,
+        })
+        client.get("/api/numbers")
+        client.put(f"/api/prompts/{prompt_id}", json={"name": "Renamed"})
+        assert client.get("/api/numbers").json()[0]["prompt_name"] == "Renamed"
+
+
+class TestConditionalGet:
+    """Test ETag / 304 handling of the list endpoints."""
+
+    @pytest.mark.parametrize("url", ["/api/prompts", "/api/admin/bootstrap"])
+    def test_304_until_write(self, client, url):
+        etag = client.get(url).headers["etag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        client.post("/api/prompts", json={"name": "Custom", "content": "Hi"})
+        r = client.get(url, headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.headers["etag"] != etag
+
+    def test_racing_write_not_confirmed(self, client):
+        """A body fetched across a write is neither cached nor later confirmed by a 304."""
+        from src import admin
+
+        class FakeRequest:
+            headers = {}
+
+        def racing_fetch():
+            admin._invalidate("prompts")  # a write lands mid-fetch
+            return ["pre-write rows"]
+
+        r = admin._conditional(FakeRequest(), {"prompts": racing_fetch})
+        assert "prompts" not in admin._list_cache
+
+        FakeRequest.headers = {"if-none-match": r.headers["etag"]}
+        r = admin._conditional(FakeRequest(), {"prompts": lambda: ["current rows"]})
+        assert r.status_code == 200
+        assert r.body == b'["current rows"]'
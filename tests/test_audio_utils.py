@@ -0,0 +1,213 @@
+"""
+Audio conversion tests (no models needed).
+
+Run with: pytest tests/test_audio_utils.py
+"""
+import sys
+import os
+import warnings
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    audioop = pytest.importorskip("audioop")  # reference implementation (removed in 3.13)
+
+
+class TestMulawDecode:
+    """Test Twilio mu-law -> PCM conversion."""
+
+    def test_table_matches_audioop(self):
+        """Decode table agrees with audioop.ulaw2lin for every byte."""
+        from src.audio_utils import MULAW_DECODE
+        expected = np.frombuffer(audioop.ulaw2lin(bytes(range(256)), 2), dtype=np.int16)
+        np.testing.assert_array_equal(MULAW_DECODE, expected)
+
+    def test_frame_length(self):
+        """A 20ms Twilio frame (160 bytes @ 8kHz) becomes exactly 20ms @ 16kHz."""
+        import base64
+        from src.audio_utils import mulaw_to_pcm16k
+        payload = base64.b64encode(bytes(range(160))).decode("ascii")
+        assert len(mulaw_to_pcm16k(payload)) == 320 * 2
+
+    def test_stream_matches_one_shot(self):
+        """Frames decoded in batches join into the one-shot decode (seams interpolated)."""
+        import base64
+        from src.audio_utils import MulawStreamDecoder, mulaw_to_pcm16k
+        rng = np.random.default_rng(0)
+        raw = [rng.integers(0, 256, n, dtype=np.uint8).tobytes() for n in (160, 0, 160, 1, 37, 160)]
+        payloads = [base64.b64encode(r).decode("ascii") for r in raw]
+
+        decoder = MulawStreamDecoder()
+        frames = decoder.decode(payloads[:1]) + decoder.decode(payloads[1:4]) + decoder.decode(payloads[4:])
+        assert len(frames) == len(payloads)
+
+        # Everything but the held-back final sample pair
+        expected = mulaw_to_pcm16k(base64.b64encode(b"".join(raw)).decode("ascii"))
+        assert b"".join(bytes(f) for f in frames) == expected[:-4]
+        # Each view covers its frame, shifted one sample earlier
+        assert [len(f) for f in frames] == [4 * 159, 0, 4 * 160, 4, 4 * 37, 4 * 160]
+
+
+class TestMulawEncode:
+    """Test PCM -> Twilio mu-law conversion."""
+
+    def test_table_matches_audioop(self):
+        """Encode table agrees with audioop.lin2ulaw for every int16 value."""
+        from src.audio_utils import MULAW_ENCODE
+        pcm = np.arange(-32768, 32768, dtype=np.int16)
+        expected = np.frombuffer(audioop.lin2ulaw(pcm.tobytes(), 2), dtype=np.uint8)
+        np.testing.assert_array_equal(MULAW_ENCODE[pcm.view(np.uint16)], expected)
+
+    def test_encoder_matches_table(self):
+        """encode_mulaw (numba kernel when installed) agrees with the table."""
+        from src.audio_utils import MULAW_ENCODE, encode_mulaw
+        pcm = np.arange(-32768, 32768, dtype=np.int16)
+        np.testing.assert_array_equal(encode_mulaw(pcm), MULAW_ENCODE[pcm.view(np.uint16)])
+
+    def test_numba_kernel_matches_table(self):
+        """The numba kernel agrees with the table over all int16, read-only input included."""
+        pytest.importorskip("numba")
+        from src.audio_utils import MULAW_ENCODE, _encode_mulaw
+        pcm = np.arange(-32768, 32768, dtype=np.int16)
+        expected = MULAW_ENCODE[pcm.view(np.uint16)]
+        np.testing.assert_array_equal(_encode_mulaw(pcm, np.empty(len(pcm), np.uint8)), expected)
+        readonly = np.frombuffer(pcm.tobytes(), dtype=np.int16)
+        np.testing.assert_array_equal(_encode_mulaw(readonly, np.empty(len(pcm), np.uint8)), expected)
+
+    def test_passthrough_round_trip(self):
+        """8kHz input is encoded as-is, so decode(encode(x)) is exact on table values."""
+        import base64
+        from src.audio_utils import MULAW_DECODE, pcm_to_mulaw8k
+        mulaw = base64.b64decode(pcm_to_mulaw8k(MULAW_DECODE.tobytes(), input_rate=8000))
+        np.testing.assert_array_equal(MULAW_DECODE[np.frombuffer(mulaw, np.uint8)], MULAW_DECODE)
+
+
+class TestResample:
+    """Test fixed-ratio resampling."""
+
+    def test_upsample_interpolates(self):
+        """Odd samples are midpoints; input samples land on even indices."""
+        from src.audio_utils import upsample_2x
+        out = upsample_2x(np.array([0, 100, -100], dtype=np.int16))
+        np.testing.assert_array_equal(out, [0, 50, 100, 0, -100, -100])
+
+    def test_decimate_keeps_passband(self):
+        """A 1kHz tone survives 24k -> 8k at (nearly) full amplitude."""
+        from src.audio_utils import decimate
+        t = np.arange(24000) / 24000
+        tone = (8000 * np.sin(2 * np.pi * 1000 * t)).astype(np.int16)
+        out = decimate(tone, 3)
+        assert len(out) == 8000
+        assert np.abs(out[100:-100]).max() > 7500
+
+    def test_decimate_rejects_alias(self):
+        """A 5kHz tone (above the 4kHz output Nyquist) is filtered out."""
+        from src.audio_utils import decimate
+        t = np.arange(24000) / 24000
+        tone = (8000 * np.sin(2 * np.pi * 5000 * t)).astype(np.int16)
+        assert np.abs(decimate(tone, 3)[100:-100]).max() < 100
+
+    def test_resample_any_ratio(self):
+        """22.05k -> 8k keeps a 1kHz tone and rejects a 5kHz one."""
+        from src.audio_utils import resample
+        t = np.arange(22050) / 22050
+        low = (8000 * np.sin(2 * np.pi * 1000 * t)).astype(np.int16)
+        high = (8000 * np.sin(2 * np.pi * 5000 * t)).astype(np.int16)
+        out = resample(low, 22050, 8000)
+        assert len(out) == 8000
+        assert np.abs(out[100:-100]).max() > 7500
+        assert np.abs(resample(high, 22050, 8000)[100:-100]).max() < 200
+
+
+class TestAudioBuffer:
+    """Test Twilio frame buffering."""
+
+    def test_matches_one_shot_decode(self):
+        """Buffered frames decode like the whole stream at once (seams interpolated)."""
+        import base64
+        from src.audio_utils import AudioBuffer, mulaw_to_pcm16k
+        frame = base64.b64encode(bytes(range(160))).decode("ascii")
+        both = base64.b64encode(bytes(range(160)) * 2).decode("ascii")
+        buf = AudioBuffer(min_duration_ms=40)
+        assert buf.add_chunk(frame) is None
+        assert buf.add_chunk(frame) == mulaw_to_pcm16k(both)
+
+    def test_drained_view_not_overwritten(self):
+        """A returned view keeps its audio after more frames are buffered."""
+        import base64
+        from src.audio_utils import AudioBuffer, mulaw_to_pcm16k
+        first = base64.b64encode(bytes(range(160))).decode("ascii")
+        second = base64.b64encode(bytes(range(96, 256))).decode("ascii")
+        buf = AudioBuffer(min_duration_ms=20)
+        audio = buf.add_chunk(first)
+        assert buf.add_chunk(second) == mulaw_to_pcm16k(second)
+        assert audio == mulaw_to_pcm16k(first)
+
+    def test_flush_and_oversized_frame(self):
+        """Frames larger than the preallocation grow it; flush returns the remainder."""
+        import base64
+        from src.audio_utils import AudioBuffer, mulaw_to_pcm16k
+        big = base64.b64encode(bytes(range(256)) * 4).decode("ascii")
+        small = base64.b64encode(bytes(80)).decode("ascii")
+        buf = AudioBuffer(min_duration_ms=500)
+        assert buf.add_chunk(small) is None
+        assert buf.add_chunk(big) is None
+        joined = base64.b64encode(bytes(80) + bytes(range(256)) * 4).decode("ascii")
+        assert buf.flush() == mulaw_to_pcm16k(joined)
+        assert buf.flush() is None
+
+
+class TestStreamingChunks:
+    """Test outbound chunking."""
+
+    def test_chunks_round_trip(self):
+        """Chunks decode back to the original bytes, last one short."""
+        import base64
+        from src.audio_utils import chunk_audio_for_streaming
+        audio = bytes(range(256)) * 6
+        chunks = list(chunk_audio_for_streaming(audio, chunk_size=640))
+        assert len(chunks) == 3
+        assert b"".join(base64.b64decode(c) for c in chunks) == audio
+
+
+class TestSpeechEnd:
+    """Test the RMS silence check."""
+
+    def test_threshold_matches_float_rms(self):
+        """Integer sum-of-squares agrees with the float RMS, incl. full scale."""
+        from src.audio_utils import detect_speech_end
+        rng = np.random.default_rng(0)
+        for scale in (100, 499, 501, 2000, 32767):
+            pcm = np.clip(rng.normal(0, scale, 8000), -32768, 32767).astype(np.int16)
+            rms = np.sqrt(np.mean(pcm.astype(np.float64) ** 2))
+            assert detect_speech_end(pcm.tobytes(), threshold=500) == (rms < 500)
+        assert detect_speech_end(b"") is True
+
+
+class TestWav:
+    """Test WAV wrapping."""
+
+    def test_header_fields(self):
+        """Header sizes are patched per call on top of the cached template."""
+        import io
+        import wave
+        from src.audio_utils import pcm_to_wav_bytes
+        for pcm, rate in ((bytes(640), 16000), (bytes(range(256)) * 3, 8000)):
+            with wave.open(io.BytesIO(pcm_to_wav_bytes(pcm, sample_rate=rate))) as w:
+                assert w.getframerate() == rate
+                assert w.getnchannels() == 1
+                assert w.getsampwidth() == 2
+                assert w.readframes(w.getnframes()) == pcm
+
+    def test_float32_samples(self):
+        """STT float32 path scales int16 into [-1, 1)."""
+        from src.audio_utils import pcm_bytes_to_float32
+        pcm = np.array([-32768, -16384, 0, 16384, 32767], dtype=np.int16)
+        audio = pcm_bytes_to_float32(bytearray(pcm.tobytes()))
+        assert audio.dtype == np.float32
+        np.testing.assert_allclose(audio, pcm / 32768.0)
@@ -0,0 +1,125 @@
+"""
+Database tests (SQLite only, no models needed).
+
+Run with: pytest tests/test_database.py
+"""
+import sys
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A freshly initialized database in a temp dir."""
+    from src import database
+    database.close_all()
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "buddyhelps.db"))
+    database.invalidate_config()
+    database.init_db()
+    yield database
+    database.close_all()
+    database.invalidate_config()
+
+
+class TestConfigCache:
+    """Test the get_config_for_call TTL cache."""
+
+    def test_cached_until_write(self, db):
+        """Repeat lookups share one result; a write to the number drops it."""
+        db.add_number("+15550000001", "Acme")
+        first = db.get_config_for_call("+15550000001")
+        assert db.get_config_for_call("+15550000001") is first
+
+        db.update_number("+15550000001", business_name="Acme Plumbing")
+        assert db.get_config_for_call("+15550000001")["business_name"] == "Acme Plumbing"
+
+    def test_write_during_lookup_not_cached(self, db, monkeypatch):
+        """A lookup that raced an invalidation returns its rows but doesn't cache them."""
+        db.add_number("+15550000001", "Acme")
+        real_get_db = db.get_db
+
+        @contextmanager
+        def racing_get_db():
+            with real_get_db() as conn:
+                db.invalidate_config("+15550000001")  # a write lands mid-query
+                yield conn
+
+        monkeypatch.setattr(db, "get_db", racing_get_db)
+        assert db.get_config_for_call("+15550000001")["business_name"] == "Acme"
+        assert "+15550000001" not in db._config_cache
+
+    def test_corrections_compiled(self, db):
+        """Linked keyword sets come back parsed and compiled."""
+        keywords = db.get_all_keywords()[0]
+        db.add_number("+15550000001", "Acme", keyword_corrections_id=keywords["id"])
+        config = db.get_config_for_call("+15550000001")
+        assert config["keyword_corrections"] == db.DEFAULT_PLUMBING_CORRECTIONS
+        assert config["keyword_corrector"].apply("the toylet is quogged") == "the toilet is clogged"
+
+
+class TestInserts:
+    """Test the add_* functions return the stored row."""
+
+    def test_rows_match_reads(self, db):
+        """Each add returns exactly what the matching get returns."""
+        number = db.add_number("+15550000001", "Acme", is_demo=True)
+        assert number == db.get_number("+15550000001")
+        assert number["is_demo"] == 1
+
+        prompt = db.add_prompt("Custom", "Hi from {business_name}")
+        assert prompt == db.get_prompt(prompt["id"])
+
+        keywords = db.add_keywords("Custom", {"sump": "sump pump"})
+        assert keywords == db.get_keywords(keywords["id"])
+        assert keywords["corrections"] == {"sump": "sump pump"}
+
+    def test_without_returning(self, db, monkeypatch):
+        """SQLite < 3.35 fallback reads the new row back by rowid."""
+        monkeypatch.setattr(db, "SQLITE_HAS_RETURNING", False)
+        monkeypatch.setattr(db, "SQL_INSERT_PROMPT", db.SQL_INSERT_PROMPT.replace(" RETURNING *", ""))
+        prompt = db.add_prompt("Custom", "Hi")
+        assert prompt == db.get_prompt(prompt["id"])
+
+    def test_duplicate_raises(self, db):
+        db.add_number("+15550000001", "Acme")
+        with pytest.raises(sqlite3.IntegrityError):
+            db.add_number("+15550000001", "Acme")
+
+
+class TestUpdates:
+    """Test the update_* functions."""
+
+    def test_every_subset_built(self, db):
+        assert len(db._UPDATE_NUMBER_SQL) == 2 ** len(db.NUMBER_UPDATE_FIELDS) - 1
+        assert len(db._UPDATE_PROMPT_SQL) == 3
+        assert len(db._UPDATE_KEYWORDS_SQL) == 3
+
+    def test_field_order_independent(self, db):
+        """Any kwarg order binds values to the right columns."""
+        db.add_number("+15550000001", "Acme")
+        row = db.update_number("+15550000001", is_active=False, business_name="B")
+        assert (row["business_name"], row["is_active"]) == ("B", 0)
+        row = db.update_number("+15550000001", business_name="C", is_active=True)
+        assert (row["business_name"], row["is_active"]) == ("C", 1)
+
+    def test_missing_row(self, db):
+        assert db.update_number("+15550009999", business_name="B") is None
+        assert db.update_prompt(9999, name="B") is None
+        assert db.update_keywords(9999, name="B") is None
+
+    def test_without_returning(self, db, monkeypatch):
+        """SQLite < 3.35 fallback re-reads the row, or reports no match."""
+        monkeypatch.setattr(db, "SQLITE_HAS_RETURNING", False)
+        monkeypatch.setattr(db, "_UPDATE_PROMPT_SQL", {
+            key: (sql.replace(" RETURNING *", ""), fields)
+            for key, (sql, fields) in db._UPDATE_PROMPT_SQL.items()
+        })
+        prompt = db.add_prompt("Custom", "Hi")
+        assert db.update_prompt(prompt["id"], content="Hello")["content"] == "Hello"
+        assert db.update_prompt(9999, content="Hello") is None